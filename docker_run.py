@@ -16,4 +16,5 @@ sys.path.insert(0, '/app/src')
 
 # Now import and run
 os.chdir('/app/src')  # Change to src for relative imports
-exec(open('/app/run.py').read())
+from run import main
+main()
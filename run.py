@@ -3,33 +3,7 @@
 Simple runner script for CanillitaBot - Reddit Argentina News Bot
 """
 
-import sys
-import logging
-from src.core.bot import BotManager
-from src.shared.utils import setup_logging
-
-def main():
-    """Main entry point"""
-    # Setup basic logging first
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    try:
-        # Initialize and start bot
-        bot = BotManager()
-        
-        # Setup detailed logging based on config
-        setup_logging(bot.config)
-        
-        bot.start()
-        
-    except KeyboardInterrupt:
-        logging.info("Bot stopped by user")
-    except Exception as e:
-        logging.error(f"Bot crashed: {e}")
-        sys.exit(1)
+from src.core.bot import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -11,6 +11,10 @@ from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFoun
 
 logger = logging.getLogger(__name__)
 
+_TITLE_TAG_RE = re.compile(r'<title>(.+?)</title>')
+_YOUTUBE_SUFFIX_RE = re.compile(r'\s*-\s*YouTube\s*$')
+_VIDEO_ID_RE = re.compile(r'(?:v=|\/|embed\/|youtu.be\/)([a-zA-Z0-9_-]{11})')
+
 class GeminiClient:
     """Simple client for Google Gemini API interactions"""
     
@@ -27,6 +31,11 @@ class GeminiClient:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
         self.client = genai.Client(api_key=self.api_key)
+        # Keep-alive session so each video's title lookup reuses the connection to YouTube
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
         logger.info("Gemini client initialized successfully")
     
     def _get_youtube_title(self, youtube_url: str) -> str:
@@ -40,15 +49,12 @@ class GeminiClient:
             The video title
         """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(youtube_url, headers=headers, timeout=10)
+            response = self.session.get(youtube_url, timeout=10)
             response.raise_for_status()
             
-            title_match = re.search(r'<title>(.+?)</title>', response.text)
+            title_match = _TITLE_TAG_RE.search(response.text)
             if title_match:
-                title = re.sub(r'\s*-\s*YouTube\s*$', '', title_match.group(1))
+                title = _YOUTUBE_SUFFIX_RE.sub('', title_match.group(1))
                 return title.strip()
             return "Video de YouTube"
         except Exception as e:
@@ -67,7 +73,7 @@ class GeminiClient:
         """
         try:
             # Extract video ID from any YouTube URL format
-            video_id_match = re.search(r'(?:v=|\/|embed\/|youtu.be\/)([a-zA-Z0-9_-]{11})', youtube_url)
+            video_id_match = _VIDEO_ID_RE.search(youtube_url)
             if not video_id_match:
                 logger.warning(f"Could not extract video ID from URL: {youtube_url}")
                 return None
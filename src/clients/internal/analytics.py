@@ -1,22 +1,27 @@
 import time
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict
 from src.core.config import Config
+from .connection import RedditConnection
 
 logger = logging.getLogger(__name__)
 
+# Inbox items scanned by check_comment_replies_bulk; Reddit serves at most 100 per request
+INBOX_SCAN_LIMIT = 500
+
 class CommentAnalytics:
     """Handles analytics and statistics for Reddit comments"""
     
-    def __init__(self, config: Config, reddit):
+    def __init__(self, config: Config, connection: RedditConnection):
         self.config = config
-        self.reddit = reddit
+        self.connection = connection
+        self.reddit = connection.get_reddit_instance()
     
     def get_bot_comments(self, limit: int = 25, subreddit: str = None) -> List[Dict]:
         """Get recent comments made by the bot"""
         try:
-            user = self.reddit.user.me()
+            user = self.connection.get_me()
             comments = []
             
             for comment in user.comments.new(limit=limit):
@@ -31,9 +36,11 @@ class CommentAnalytics:
                     'created_utc': comment.created_utc,
                     'subreddit': comment.subreddit.display_name,
                     'permalink': f"https://reddit.com{comment.permalink}",
-                    'submission_title': comment.submission.title if comment.submission else '',
-                    'submission_url': comment.submission.url if comment.submission else '',
-                    'submission_id': comment.submission.id if comment.submission else '',
+                    # User comment listings carry the parent post's fields; going through
+                    # comment.submission would fetch every post with its own request
+                    'submission_title': comment.link_title,
+                    'submission_url': comment.link_url,
+                    'submission_id': comment.link_id.split('_', 1)[-1],
                     'is_edited': comment.edited != False,
                     'gilded': comment.gilded,
                     'controversiality': comment.controversiality
@@ -50,7 +57,7 @@ class CommentAnalytics:
         """Get statistics about bot comments in the last N days"""
         try:
             cutoff_time = time.time() - (days * 24 * 3600)
-            user = self.reddit.user.me()
+            user = self.connection.get_me()
             
             stats = {
                 'total_comments': 0,
@@ -63,8 +70,6 @@ class CommentAnalytics:
                 'recent_comments': []
             }
             
-            scores = []
-            
             for comment in user.comments.new(limit=100):  # Check more comments for stats
                 if comment.created_utc < cutoff_time:
                     break
@@ -72,7 +77,6 @@ class CommentAnalytics:
                 stats['total_comments'] += 1
                 stats['by_subreddit'][comment.subreddit.display_name] += 1
                 stats['total_score'] += comment.score
-                scores.append(comment.score)
                 
                 if comment.controversiality > 0:
                     stats['controversial_count'] += 1
@@ -91,7 +95,8 @@ class CommentAnalytics:
                         'permalink': f"https://reddit.com{comment.permalink}"
                     })
             
-            stats['average_score'] = sum(scores) / len(scores) if scores else 0
+            # Running totals already give the mean; no per-comment score list needed
+            stats['average_score'] = stats['total_score'] / stats['total_comments'] if stats['total_comments'] else 0
             stats['by_subreddit'] = dict(stats['by_subreddit'])  # Convert back to regular dict
             
             return stats
@@ -124,3 +129,61 @@ class CommentAnalytics:
         except Exception as e:
             logger.error(f"Error checking replies for comment {comment_id}: {e}")
             return []
+    
+    def check_comment_replies_bulk(self, comment_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Check replies to several bot comments at once, keyed by comment ID
+        
+        Reddit puts every direct reply to the bot in its inbox (the bot posts with inbox
+        replies on), so a few inbox listing pages replace a refresh() request per comment.
+        Comments the scan cannot vouch for, because their replies may be older than the
+        latest INBOX_SCAN_LIMIT inbox items or the inbox could not be read, fall back to
+        check_comment_replies().
+        """
+        parents = {f"t1_{comment_id}": comment_id for comment_id in comment_ids}
+        replies = {comment_id: [] for comment_id in comment_ids}
+        if not parents:
+            return replies
+        
+        scanned = 0
+        oldest_reply_id = None
+        try:
+            for reply in self.reddit.inbox.comment_replies(limit=INBOX_SCAN_LIMIT):
+                scanned += 1
+                oldest_reply_id = reply.id
+                comment_id = parents.get(reply.parent_id)
+                if comment_id and reply.author:
+                    replies[comment_id].append({
+                        'id': reply.id,
+                        'author': reply.author.name,
+                        'body': reply.body,
+                        'score': reply.score,
+                        'created_utc': reply.created_utc,
+                        # Inbox items carry a context link instead of a permalink
+                        'permalink': f"https://reddit.com{reply.context.split('?', 1)[0]}"
+                    })
+            
+        except Exception as e:
+            logger.error(f"Error checking replies for {len(parents)} comments: {e}")
+            unconfirmed = list(replies)
+        else:
+            unconfirmed = self._unconfirmed_by_inbox(replies, scanned, oldest_reply_id)
+        
+        if unconfirmed:
+            logger.info(f"Inbox scan could not confirm replies for {len(unconfirmed)} comments, checking them one by one")
+            for comment_id in unconfirmed:
+                replies[comment_id] = self.check_comment_replies(comment_id)
+        
+        return replies
+    
+    @staticmethod
+    def _unconfirmed_by_inbox(comment_ids, scanned: int, oldest_reply_id: Optional[str]) -> List[str]:
+        """Comments that may have replies older than the oldest inbox item scanned
+        
+        A full scan stops before the end of the inbox. Reddit IDs are base-36 sequence numbers,
+        so every reply to a comment newer than the oldest scanned reply was seen; older
+        comments may have replies further back.
+        """
+        if scanned < INBOX_SCAN_LIMIT or oldest_reply_id is None:
+            return []
+        horizon = int(oldest_reply_id, 36)
+        return [comment_id for comment_id in comment_ids if int(comment_id, 36) < horizon]
@@ -1,17 +1,84 @@
+import re
 import time
+import hashlib
 import logging
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+from praw.exceptions import RedditAPIException
 from praw.models import Submission
 from src.core.config import Config
+from src.shared.utils import TTLCache
+from .connection import RedditConnection
+
+if TYPE_CHECKING:
+    from src.core.database import Database
 
 logger = logging.getLogger(__name__)
 
+COMMENTED_CACHE_SIZE = 1024
+COMMENTED_CACHE_TTL = 24 * 3600  # seconds; posts are only processed within their first hour
+# The bot's own recent comments checked for an earlier reply; one listing page at most
+OWN_COMMENTS_SCAN_LIMIT = 100
+
+# Formatted comment sets kept for retries of the same article, keyed by a content digest
+FORMATTED_CACHE_SIZE = 256
+FORMATTED_CACHE_TTL = 3600  # seconds
+
+# Greedy, so a match from a given position ends just after the last '. ', '.\n', '! ', ... in the text
+_LAST_SENTENCE_END_RE = re.compile(r'.*[.!?][ \n]', re.DOTALL)
+_LEADING_WHITESPACE_RE = re.compile(r'\s*')
+
+# Requests left in Reddit's rate-limit window below which replies are spread over the reset
+RATE_LIMIT_HEADROOM = 5
+REPLY_DELAY = 2  # seconds between replies before any rate-limit headers have been seen
+
+# Reddit's per-account posting limit is separate from the OAuth quota above and is only
+# reported as a RATELIMIT API error, e.g. "Take a break for 3 minutes before trying again."
+_RATELIMIT_DELAY_RE = re.compile(r'(\d+)\s*(millisecond|second|minute)', re.IGNORECASE)
+_RATELIMIT_UNIT_SECONDS = {'millisecond': 0.001, 'second': 1, 'minute': 60}
+RATELIMIT_DEFAULT_DELAY = 60  # seconds, when the error does not say how long to wait
+# Longest a submission's replies may sleep on the posting limit; the polling thread serves
+# every subreddit, so parts that would wait longer are deferred to a later cycle instead
+RATELIMIT_WAIT_BUDGET = 10 * 60  # seconds
+
+class _ReplyDeferred(Exception):
+    """The posting limit asks for a longer wait than the submission has left"""
+    
+    def __init__(self, delay: float):
+        super().__init__(f"rate limited for {delay:.0f}s")
+        self.delay = delay
+
+def _ratelimit_delay(error: RedditAPIException) -> Optional[float]:
+    """Seconds Reddit asks to wait in a RATELIMIT error, or None for any other API error"""
+    for item in error.items:
+        if item.error_type != 'RATELIMIT':
+            continue
+        match = _RATELIMIT_DELAY_RE.search(item.message or '')
+        if not match:
+            return RATELIMIT_DEFAULT_DELAY
+        # Reddit rounds down, so wait one second past the advertised delay
+        return int(match.group(1)) * _RATELIMIT_UNIT_SECONDS[match.group(2).lower()] + 1
+    return None
+
 class CommentManager:
     """Handles posting and formatting of Reddit comments"""
     
-    def __init__(self, config: Config, reddit):
+    def __init__(self, config: Config, connection: RedditConnection, database: Optional['Database'] = None):
         self.config = config
-        self.reddit = reddit
+        self.connection = connection
+        self.reddit = connection.get_reddit_instance()
+        # Submissions already replied to, checked before any request: recent ones in memory,
+        # and with a database, every reply from any process and across restarts
+        self._commented = TTLCache(maxsize=COMMENTED_CACHE_SIZE, ttl=COMMENTED_CACHE_TTL)
+        self.database = database
+        self._formatted = TTLCache(maxsize=FORMATTED_CACHE_SIZE, ttl=FORMATTED_CACHE_TTL)
+        # Continuation template text around the content; unlike the main template it has no per-article fields
+        self._continuation_overhead = len(config.continuation_template.format(content=""))
+        # Posts under the bot's latest comments; one listing serves every post of a polling cycle
+        self._own_comment_links: FrozenSet[str] = frozenset()
+        self._own_comments_listed_at: Optional[float] = None
+        # Continuation parts held back by the posting limit, per submission ID:
+        # (main comment, parts left, number of the first part left, monotonic time to resume)
+        self._deferred: Dict[str, Tuple[Any, List[str], int, float]] = {}
     
     def post_comment(self, submission: Submission, content: str) -> bool:
         """Post a comment on a submission (backwards compatibility)"""
@@ -21,18 +88,19 @@ class CommentManager:
         """Post comment(s) on a submission, with replies for long articles"""
         try:
             # Check if we already commented
-            submission.comments.replace_more(limit=0)
-            for comment in submission.comments:
-                if comment.author and comment.author.name == self.config.reddit_username:
-                    logger.info(f"Already commented on post {submission.id}")
-                    return True
+            if self.has_commented(submission):
+                logger.info(f"Already commented on post {submission.id}")
+                return True
             
             if not comments:
                 logger.warning("No comments to post")
                 return False
             
+            deadline = time.monotonic() + RATELIMIT_WAIT_BUDGET
+            
             # Post the main comment
-            main_comment = submission.reply(comments[0])
+            main_comment = self._reply(submission, comments[0], deadline)
+            self._remember_commented(submission.id)
             
             # Try to sticky/pin the comment (only works if bot is a moderator)
             try:
@@ -42,21 +110,8 @@ class CommentManager:
                 logger.debug(f"Could not pin comment (not a moderator): {pin_error}")
                 logger.info(f"Posted main comment on post {submission.id}: {submission.title}")
             
-            # Rate limiting after main comment
-            time.sleep(2)
-            
             # Post continuation comments as replies to the main comment
-            for i, continuation_content in enumerate(comments[1:], 1):
-                try:
-                    reply = main_comment.reply(continuation_content)
-                    logger.info(f"Posted continuation comment {i} on post {submission.id}")
-                    
-                    # Rate limiting between continuation comments
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to post continuation comment {i} on {submission.id}: {e}")
-                    # Continue with remaining parts even if one fails
+            self._post_continuations(submission.id, main_comment, comments[1:], 1, deadline)
             
             total_comments = len(comments)
             logger.info(f"Successfully posted {total_comments} comment(s) on post {submission.id}")
@@ -66,8 +121,116 @@ class CommentManager:
             logger.error(f"Failed to post comments on {submission.id}: {e}")
             return False
     
+    def _post_continuations(self, submission_id: str, main_comment, parts: List[str], first_number: int, deadline: float):
+        for offset, content in enumerate(parts):
+            number = first_number + offset
+            try:
+                self._pace_replies()
+                self._reply(main_comment, content, deadline)
+                logger.info(f"Posted continuation comment {number} on post {submission_id}")
+                
+            except _ReplyDeferred as deferred:
+                self._deferred[submission_id] = (main_comment, parts[offset:], number, time.monotonic() + deferred.delay)
+                logger.warning(f"Deferring {len(parts) - offset} continuation comment(s) on {submission_id} "
+                               f"for {deferred.delay:.0f}s")
+                return
+                
+            except Exception as e:
+                logger.error(f"Failed to post continuation comment {number} on {submission_id}: {e}")
+                # Continue with remaining parts even if one fails
+    
+    def post_deferred_replies(self) -> int:
+        """Post continuation parts held back by the posting limit once their wait is over, returning how many submissions resumed"""
+        now = time.monotonic()
+        ready = [submission_id for submission_id, entry in self._deferred.items() if entry[3] <= now]
+        for submission_id in ready:
+            main_comment, parts, first_number, _ = self._deferred.pop(submission_id)
+            self._post_continuations(submission_id, main_comment, parts, first_number,
+                                     time.monotonic() + RATELIMIT_WAIT_BUDGET)
+        return len(ready)
+    
+    def _reply(self, parent, body: str, deadline: float):
+        """Reply to a submission or comment, waiting out Reddit's posting rate limit until the deadline"""
+        while True:
+            try:
+                return parent.reply(body)
+            except RedditAPIException as e:
+                delay = _ratelimit_delay(e)
+                if delay is None:
+                    raise
+                if time.monotonic() + delay > deadline:
+                    raise _ReplyDeferred(delay) from e
+                logger.warning(f"Reddit posting rate limit hit, retrying in {delay:.0f}s")
+                time.sleep(delay)
+    
+    def _pace_replies(self):
+        """Wait before another reply only when Reddit's rate-limit window is nearly used up"""
+        limits = self.reddit.auth.limits
+        remaining = limits.get('remaining')
+        reset_timestamp = limits.get('reset_timestamp')
+        if remaining is None or reset_timestamp is None:
+            time.sleep(REPLY_DELAY)
+            return
+        
+        if remaining > RATE_LIMIT_HEADROOM:
+            return
+        
+        # Spread what is left of the window over the requests still allowed in it
+        time.sleep(max(0, reset_timestamp - time.time()) / max(remaining, 1))
+    
+    def has_commented(self, submission: Submission) -> bool:
+        """Whether the bot account already replied to a submission.
+        
+        Looks at the bot's own latest comments rather than loading the submission's comment
+        tree, which costs a request sized by the thread and misses replies hidden behind 'more'.
+        """
+        if self._commented.get(submission.id):
+            return True
+        
+        if self.database and self.database.has_commented_on(submission.id):
+            self._commented.set(submission.id, True)
+            return True
+        
+        if submission.fullname in self._recent_comment_links():
+            self._remember_commented(submission.id)
+            return True
+        return False
+    
+    def _recent_comment_links(self) -> FrozenSet[str]:
+        """Fullnames of the posts under the bot's latest comments, listed at most once per polling cycle
+        
+        Comments this process posts after the listing are already in _commented.
+        """
+        now = time.monotonic()
+        if self._own_comments_listed_at is None or now - self._own_comments_listed_at >= self.config.min_check_interval:
+            bot_account = self.connection.get_me()
+            self._own_comment_links = frozenset(
+                comment.link_id for comment in bot_account.comments.new(limit=OWN_COMMENTS_SCAN_LIMIT)
+            )
+            self._own_comments_listed_at = now
+        return self._own_comment_links
+    
+    def _remember_commented(self, submission_id: str):
+        self._commented.set(submission_id, True)
+        if self.database:
+            self.database.record_comment(submission_id)
+    
     def format_comment(self, article_content: str, article_url: str, article_title: str = "") -> List[str]:
         """Format article content into Reddit comment(s), splitting if necessary"""
+        # Retries format the same article again; the digest keeps the key small. Templates and
+        # max_comment_length are fixed for the config's lifetime, as _continuation_overhead assumes
+        cache_key = (
+            hashlib.blake2b(article_content.encode('utf-8'), digest_size=16).digest(),
+            article_url,
+            article_title,
+        )
+        formatted = self._formatted.get(cache_key)
+        if formatted is None:
+            formatted = tuple(self._format_comment(article_content, article_url, article_title))
+            self._formatted.set(cache_key, formatted)
+        return list(formatted)
+    
+    def _format_comment(self, article_content: str, article_url: str, article_title: str) -> List[str]:
         # Format the main comment with title
         main_comment = self.config.comment_template.format(
             content="",  # We'll add content separately
@@ -108,68 +271,57 @@ class CommentManager:
         if not content:
             return [""]
         
-        parts = []
-        remaining_content = content
-        
         # First chunk - fits in main comment with template overhead
-        if len(remaining_content) <= first_comment_space:
-            return [remaining_content]
-        
-        # Find good breaking point for first chunk
-        first_chunk = remaining_content[:first_comment_space]
-        break_point = self._find_good_break_point(first_chunk)
-        
-        if break_point > 0:
-            first_chunk = remaining_content[:break_point]
-            remaining_content = remaining_content[break_point:].lstrip()
-        else:
-            remaining_content = remaining_content[first_comment_space:].lstrip()
-        
-        parts.append(first_chunk)
+        if len(content) <= first_comment_space:
+            return [content]
         
         # Remaining chunks - fit in continuation comments
-        continuation_space = self.config.max_comment_length - len(self.config.continuation_template.format(content=""))
+        continuation_space = self.config.max_comment_length - self._continuation_overhead
         
-        while remaining_content:
-            if len(remaining_content) <= continuation_space:
-                parts.append(remaining_content)
-                break
-            
-            chunk = remaining_content[:continuation_space]
-            break_point = self._find_good_break_point(chunk)
+        # Walk an offset through content rather than re-slicing the remaining text for every chunk
+        parts = []
+        pos = 0
+        space = first_comment_space
+        while True:
+            end = pos + space
+            # Find good breaking point for this chunk
+            break_point = self._find_good_break_point(content, pos, end)
+            chunk_end = pos + break_point if break_point > 0 else end
+            parts.append(content[pos:chunk_end])
             
-            if break_point > 0:
-                chunk = remaining_content[:break_point]
-                remaining_content = remaining_content[break_point:].lstrip()
-            else:
-                remaining_content = remaining_content[continuation_space:].lstrip()
+            pos = _LEADING_WHITESPACE_RE.match(content, chunk_end).end()
+            if pos >= len(content):
+                break
             
-            parts.append(chunk)
+            space = continuation_space
+            if len(content) - pos <= space:
+                parts.append(content[pos:])
+                break
         
         return parts
     
-    def _find_good_break_point(self, text: str) -> int:
-        """Find a good place to break text (end of paragraph, sentence, etc.)"""
-        # Prefer breaking at paragraph boundaries
-        last_double_newline = text.rfind('\n\n')
-        if last_double_newline > len(text) * 0.7:
-            return last_double_newline + 2
+    def _find_good_break_point(self, text: str, start: int = 0, end: Optional[int] = None) -> int:
+        """Find a good place to break text[start:end] (end of paragraph, sentence, etc.), as an offset from start"""
+        if end is None:
+            end = len(text)
+        length = end - start
         
-        # Next preference: end of sentence
-        sentence_endings = ['. ', '.\n', '! ', '!\n', '? ', '?\n']
-        best_break = -1
+        # Only breaks in the last 30% of the text count, so nothing before that is scanned
+        tail_start = start + int(length * 0.7) + 1
         
-        for ending in sentence_endings:
-            pos = text.rfind(ending)
-            if pos > len(text) * 0.7 and pos > best_break:
-                best_break = pos + len(ending)
+        # Prefer breaking at paragraph boundaries
+        last_double_newline = text.rfind('\n\n', tail_start, end)
+        if last_double_newline >= 0:
+            return last_double_newline + 2 - start
         
-        if best_break > 0:
-            return best_break
+        # Next preference: end of sentence
+        sentence_end = _LAST_SENTENCE_END_RE.match(text, tail_start, end)
+        if sentence_end:
+            return sentence_end.end() - start
         
         # Fallback: break at word boundary
-        last_space = text.rfind(' ')
-        if last_space > len(text) * 0.8:
-            return last_space + 1
+        last_space = text.rfind(' ', start + int(length * 0.8) + 1, end)
+        if last_space >= 0:
+            return last_space + 1 - start
         
         return -1  # No good break point found
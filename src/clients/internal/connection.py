@@ -1,16 +1,22 @@
 import praw
+import time
 import logging
 from typing import Optional
+from praw.models import Redditor
 from src.core.config import Config
 
 logger = logging.getLogger(__name__)
 
+ME_CACHE_TTL = 3600  # seconds; the bot account does not change while running
+
 class RedditConnection:
     """Handles Reddit API connection and authentication"""
     
     def __init__(self, config: Config):
         self.config = config
         self.reddit: Optional[praw.Reddit] = None
+        self._me: Optional[Redditor] = None
+        self._me_fetched_at = 0.0
         self._connect()
     
     def _connect(self):
@@ -35,7 +41,7 @@ class RedditConnection:
         """Validate Reddit API credentials by testing basic operations"""
         try:
             # Test basic authentication
-            user = self.reddit.user.me()
+            user = self.get_me()
             if not user:
                 raise ValueError("Unable to authenticate - check username and password")
             
@@ -67,6 +73,13 @@ class RedditConnection:
             logger.error(f"Credential validation failed: {e}")
             raise ValueError(f"Reddit credentials validation failed: {e}")
     
+    def get_me(self, ttl: float = ME_CACHE_TTL) -> Optional[Redditor]:
+        """The authenticated bot account, fetched from /api/v1/me at most once per ttl"""
+        if self._me is None or time.monotonic() - self._me_fetched_at >= ttl:
+            self._me = self.get_reddit_instance().user.me()
+            self._me_fetched_at = time.monotonic()
+        return self._me
+    
     def get_reddit_instance(self) -> praw.Reddit:
         """Get the Reddit API instance"""
         if not self.reddit:
@@ -1,85 +1,191 @@
+import re
 import time
 import logging
-from typing import Iterator, List
+from typing import Collection, Dict, Iterable, Iterator, List, Optional
 from praw.models import Submission
 from src.core.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Empty cursor polls before the cursor post is checked; Reddit answers nothing at all for a
+# cursor whose post was deleted, which looks the same as a quiet subreddit
+EMPTY_POLLS_BEFORE_CURSOR_CHECK = 3
+
+def _substring_pattern(needles: Iterable[str]) -> re.Pattern:
+    """One regex that finds any of the given substrings, so a URL is scanned once for all of them.
+    
+    The alternation is factored into a prefix trie ('clarin.com|cronista.com' becomes
+    'c(?:larin\\.com|ronista\\.com)'): a plain 'a|b|c' makes the regex engine try every
+    needle at every position, which is slower than looping over them with 'in'.
+    """
+    trie: Dict[str, dict] = {}
+    for needle in needles:
+        if not needle:
+            continue
+        node = trie
+        for char in needle.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}  # a needle ends here
+    
+    if not trie:
+        return re.compile(r'(?!)')  # never matches
+    return re.compile(_trie_pattern(trie))
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # A needle ending here already matched, so whatever follows is optional
+    return f'(?:{pattern})?' if '' in node else pattern
+
+_YOUTUBE_RE = _substring_pattern(('youtube.com', 'youtu.be', 'www.youtube.com'))
+_X_TWITTER_RE = _substring_pattern(('twitter.com', 'x.com', 'www.twitter.com', 'www.x.com'))
+_X_STATUS_RE = _substring_pattern(('/status/', '/i/web/status/'))
+
 class PostMonitor:
     """Handles monitoring and filtering of Reddit posts"""
     
     def __init__(self, config: Config, reddit):
         self.config = config
         self.reddit = reddit
+        self._news_re = _substring_pattern(config.news_domains)
+        self._blocked_re = _substring_pattern(config.blocked_domains)
+        # Newest post fullname handled per subreddit, and empty polls since it last moved
+        self._cursors: Dict[str, str] = {}
+        self._empty_polls: Dict[str, int] = {}
+        # Fullnames of the page fetched behind the cursor this cycle, newest first; commit_cursor()
+        # moves the cursor as far into it as the posts the caller handled allow
+        self._pending_cursors: Dict[str, List[str]] = {}
     
-    def get_new_posts(self, subreddit_name: str, limit: int = 10) -> Iterator[Submission]:
-        """Get new posts from a subreddit"""
+    def get_new_posts(self, subreddit_name: str, limit: int = 10, only_unseen: bool = False) -> Iterator[Submission]:
+        """Get new posts from a subreddit
+        
+        With only_unseen, Reddit's 'before' cursor limits the listing to posts newer
+        than the last committed ones, so quiet subreddits return almost nothing. The
+        cursor only moves past these posts once the caller calls commit_cursor(). A full
+        page behind the cursor means a backlog, so the newest posts are fetched too and
+        a backlog never hides them.
+        """
+        if only_unseen:
+            # A cursor left from an earlier fetch must not be committed after this one fails
+            self._pending_cursors.pop(subreddit_name, None)
+        
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
             
+            cursor = self._cursors.get(subreddit_name) if only_unseen else None
+            params = {'before': cursor} if cursor else {}
+            posts = list(subreddit.new(limit=limit, params=params))
+            
+            if only_unseen:
+                self._track_cursor(subreddit_name, posts, cursor)
+                if cursor and len(posts) >= limit:
+                    page = {post.fullname for post in posts}
+                    newest = [post for post in subreddit.new(limit=limit, params={}) if post.fullname not in page]
+                    posts = newest + posts
+            
             # Get new submissions
-            for submission in subreddit.new(limit=limit):
+            for submission in posts:
                 yield submission
                 
         except Exception as e:
             logger.error(f"Error fetching posts from r/{subreddit_name}: {e}")
             return
     
-    def is_news_article(self, submission: Submission) -> bool:
-        """Check if submission contains a news article link"""
-        if not submission.url:
-            return False
+    def commit_cursor(self, subreddit_name: str, unhandled: Collection[str] = ()):
+        """Move the cursor past the posts last fetched, once they are recorded or queued
+        
+        unhandled holds fullnames of fetched posts to fetch again; the cursor stops just
+        short of the oldest of them.
+        """
+        page = self._pending_cursors.pop(subreddit_name, None)
+        if not page:
+            return
         
-        # Skip self posts
-        if submission.is_self:
+        # 'before' returns posts newer than the cursor, so it must stay older than every unhandled post
+        oldest_unhandled = max((i for i, fullname in enumerate(page) if fullname in unhandled), default=-1)
+        if oldest_unhandled + 1 < len(page):
+            self._cursors[subreddit_name] = page[oldest_unhandled + 1]
+            self._empty_polls[subreddit_name] = 0
+    
+    def reset_cursor(self, subreddit_name: str):
+        """Forget the cursor so the next poll fetches the full listing again"""
+        self._cursors.pop(subreddit_name, None)
+        self._pending_cursors.pop(subreddit_name, None)
+        self._empty_polls.pop(subreddit_name, None)
+    
+    def _track_cursor(self, subreddit_name: str, posts: List[Submission], cursor: Optional[str]):
+        if posts:
+            # Listings are newest first
+            self._pending_cursors[subreddit_name] = [post.fullname for post in posts]
+        elif cursor:
+            empty_polls = self._empty_polls.get(subreddit_name, 0) + 1
+            if empty_polls >= EMPTY_POLLS_BEFORE_CURSOR_CHECK:
+                empty_polls = 0
+                if not self._cursor_post_exists(cursor):
+                    logger.info(f"Cursor post {cursor} for r/{subreddit_name} is gone, fetching the full listing")
+                    self.reset_cursor(subreddit_name)
+                    return
+            self._empty_polls[subreddit_name] = empty_polls
+    
+    def _cursor_post_exists(self, fullname: str) -> bool:
+        try:
+            posts = list(self.reddit.info(fullnames=[fullname]))
+        except Exception as e:
+            logger.warning(f"Could not check cursor post {fullname}: {e}")
             return False
+        # Removed and deleted posts drop out of /new, so 'before' finds nothing newer than them
+        return any(post.author is not None and not post.removed_by_category for post in posts)
+    
+    def classify_submission(self, submission: Submission) -> Optional[str]:
+        """Content type of a submission's link: 'article', 'youtube', 'twitter', or None"""
+        if not submission.url or submission.is_self:
+            return None
+        return self.classify_url(submission.url)
+    
+    def classify_url(self, url: str) -> Optional[str]:
+        """Content type of a link, lowercasing it once and checking news domains first"""
+        if not url:
+            return None
         
-        # Check if URL domain is in news domains
-        for domain in self.config.news_domains:
-            if domain in submission.url.lower():
-                # Make sure it's not in blocked domains
-                for blocked in self.config.blocked_domains:
-                    if blocked in submission.url.lower():
-                        return False
-                return True
-        
-        return False
+        url_lower = url.lower()
+        if self._is_news_url(url_lower):
+            return 'article'
+        if self._is_youtube_url(url_lower):
+            return 'youtube'
+        if self._is_x_twitter_url(url_lower):
+            return 'twitter'
+        return None
+    
+    def _is_news_url(self, url_lower: str) -> bool:
+        return bool(self._news_re.search(url_lower)) and not self._blocked_re.search(url_lower)
+    
+    @staticmethod
+    def _is_youtube_url(url_lower: str) -> bool:
+        return bool(_YOUTUBE_RE.search(url_lower))
+    
+    @staticmethod
+    def _is_x_twitter_url(url_lower: str) -> bool:
+        return bool(_X_STATUS_RE.search(url_lower)) and bool(_X_TWITTER_RE.search(url_lower))
+    
+    def is_news_article(self, submission: Submission) -> bool:
+        """Check if submission contains a news article link"""
+        if not submission.url or submission.is_self:
+            return False
+        return self._is_news_url(submission.url.lower())
     
     def is_youtube_video(self, submission: Submission) -> bool:
         """Check if submission contains a YouTube video link"""
-        if not submission.url:
+        if not submission.url or submission.is_self:
             return False
-        
-        # Skip self posts
-        if submission.is_self:
-            return False
-        
-        # Check for YouTube URLs
-        youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com']
-        url_lower = submission.url.lower()
-        
-        return any(domain in url_lower for domain in youtube_domains)
+        return self._is_youtube_url(submission.url.lower())
     
     def is_x_twitter_post(self, submission: Submission) -> bool:
         """Check if submission contains an X/Twitter post link"""
-        if not submission.url:
-            return False
-        
-        # Skip self posts
-        if submission.is_self:
+        if not submission.url or submission.is_self:
             return False
-        
-        # Check for X/Twitter URLs
-        x_twitter_domains = ['twitter.com', 'x.com', 'www.twitter.com', 'www.x.com']
-        url_lower = submission.url.lower()
-        
-        # Check if URL contains X/Twitter domain and a status/tweet ID pattern
-        for domain in x_twitter_domains:
-            if domain in url_lower and ('/status/' in url_lower or '/i/web/status/' in url_lower):
-                return True
-        
-        return False
+        return self._is_x_twitter_url(submission.url.lower())
     
     def validate_submission(self, submission: Submission) -> bool:
         """Validate if submission should be processed"""
@@ -112,43 +218,12 @@ class PostMonitor:
 
     def is_news_article_url(self, url: str) -> bool:
         """Check if URL is from a news domain"""
-        if not url:
-            return False
-        
-        # Check if URL domain is in news domains
-        for domain in self.config.news_domains:
-            if domain in url.lower():
-                # Make sure it's not in blocked domains
-                for blocked in self.config.blocked_domains:
-                    if blocked in url.lower():
-                        return False
-                return True
-        
-        return False
+        return bool(url) and self._is_news_url(url.lower())
 
     def is_youtube_video_url(self, url: str) -> bool:
         """Check if URL is a YouTube video link"""
-        if not url:
-            return False
-        
-        # Check for YouTube URLs
-        youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com']
-        url_lower = url.lower()
-        
-        return any(domain in url_lower for domain in youtube_domains)
+        return bool(url) and self._is_youtube_url(url.lower())
 
     def is_x_twitter_post_url(self, url: str) -> bool:
         """Check if URL is an X/Twitter post link"""
-        if not url:
-            return False
-        
-        # Check for X/Twitter URLs
-        x_twitter_domains = ['twitter.com', 'x.com', 'www.twitter.com', 'www.x.com']
-        url_lower = url.lower()
-        
-        # Check if URL contains X/Twitter domain and a status/tweet ID pattern
-        for domain in x_twitter_domains:
-            if domain in url_lower and ('/status/' in url_lower or '/i/web/status/' in url_lower):
-                return True
-        
-        return False
+        return bool(url) and self._is_x_twitter_url(url.lower())
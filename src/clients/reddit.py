@@ -1,9 +1,12 @@
 import logging
-from typing import Iterator, List, Dict
+from typing import TYPE_CHECKING, Collection, Iterator, List, Dict, Optional
 from praw.models import Submission
 from src.core.config import Config
 from .internal import RedditConnection, PostMonitor, CommentManager, CommentAnalytics
 
+if TYPE_CHECKING:
+    from src.core.database import Database
+
 logger = logging.getLogger(__name__)
 
 class RedditClient:
@@ -14,7 +17,7 @@ class RedditClient:
     providing a unified interface while delegating to specialized components.
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, database: Optional['Database'] = None):
         self.config = config
         
         # Initialize connection component
@@ -23,8 +26,9 @@ class RedditClient:
         
         # Initialize other components with the Reddit instance
         self.monitor = PostMonitor(config, reddit)
-        self.comments = CommentManager(config, reddit)
-        self.analytics = CommentAnalytics(config, reddit)
+        # With a database, replies are remembered across processes and restarts
+        self.comments = CommentManager(config, self.connection, database)
+        self.analytics = CommentAnalytics(config, self.connection)
     
     # Delegation methods for connection functionality
     @property
@@ -33,9 +37,21 @@ class RedditClient:
         return self.connection.get_reddit_instance()
     
     # Delegation methods for post monitoring
-    def get_new_posts(self, subreddit_name: str, limit: int = 10) -> Iterator[Submission]:
+    def get_new_posts(self, subreddit_name: str, limit: int = 10, only_unseen: bool = False) -> Iterator[Submission]:
         """Get new posts from a subreddit"""
-        return self.monitor.get_new_posts(subreddit_name, limit)
+        return self.monitor.get_new_posts(subreddit_name, limit, only_unseen)
+    
+    def commit_cursor(self, subreddit_name: str, unhandled: Collection[str] = ()):
+        """Move a subreddit's polling cursor past the posts last fetched, except unhandled ones"""
+        self.monitor.commit_cursor(subreddit_name, unhandled)
+    
+    def reset_cursor(self, subreddit_name: str):
+        """Make the next poll of a subreddit fetch its full listing"""
+        self.monitor.reset_cursor(subreddit_name)
+    
+    def classify_submission(self, submission: Submission) -> Optional[str]:
+        """Content type of a submission's link: 'article', 'youtube', 'twitter', or None"""
+        return self.monitor.classify_submission(submission)
     
     def is_news_article(self, submission: Submission) -> bool:
         """Check if submission contains a news article link"""
@@ -70,6 +86,10 @@ class RedditClient:
         """Post comment(s) on a submission, with replies for long articles"""
         return self.comments.post_comments(submission, comments)
     
+    def post_deferred_replies(self) -> int:
+        """Post continuation comments that Reddit's posting limit held back"""
+        return self.comments.post_deferred_replies()
+    
     def format_comment(self, article_content: str, article_url: str, article_title: str = "") -> List[str]:
         """Format article content into Reddit comment(s), splitting if necessary"""
         return self.comments.format_comment(article_content, article_url, article_title)
@@ -87,6 +107,10 @@ class RedditClient:
         """Check replies to a specific bot comment"""
         return self.analytics.check_comment_replies(comment_id)
     
+    def check_comment_replies_bulk(self, comment_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Check replies to several bot comments at once"""
+        return self.analytics.check_comment_replies_bulk(comment_ids)
+    
     # URL checking methods for queue workers
     def is_news_article_url(self, url: str) -> bool:
         """Check if URL is a news article (for queue workers)"""
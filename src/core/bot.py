@@ -3,7 +3,6 @@ from src.core.config import Config
 from src.clients.reddit import RedditClient
 from src.extractors.article import ArticleExtractor
 from src.core.database import Database
-from src.clients.gemini import GeminiClient
 from src.extractors.x import XContentExtractor
 from src.shared.queue import QueueManager
 from src.core.monitoring import initialize_monitoring
@@ -20,14 +19,16 @@ class BotManager:
         self.config = Config(config_path)
         self.config.validate()
         
-        self.reddit_client = RedditClient(self.config)
+        self.database = Database(self.config, cache_processed=True)
+        self.reddit_client = RedditClient(self.config, self.database)
         self.article_extractor = ArticleExtractor(self.config)
-        self.database = Database(self.config)
         
         # Initialize Gemini client if YouTube is enabled
         self.gemini_client = None
         if self.config.youtube_enabled:
             try:
+                # Imported here: google-genai takes ~0.4s to load and is unused with YouTube off
+                from src.clients.gemini import GeminiClient
                 self.gemini_client = GeminiClient()
                 logger.info("Gemini client initialized for YouTube processing")
             except Exception as e:
@@ -109,8 +110,8 @@ def main():
         # Initialize and start bot
         bot = BotManager()
         
-        # Setup detailed logging based on config
-        setup_logging(bot.config)
+        # Setup detailed logging based on config; the polling loop never waits on log writes
+        setup_logging(bot.config, background=True)
         
         bot.start()
         
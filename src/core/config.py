@@ -4,10 +4,11 @@ Supports multiple environments (development, staging, production) and comprehens
 """
 
 import os
+import string
 import yaml
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import Dict, List, Any, Optional, Union, Type
+from typing import Callable, Dict, List, Any, Optional, Union, Type
 from urllib.parse import urlparse
 import logging
 from .schemas import (
@@ -22,6 +23,26 @@ class ConfigurationError(Exception):
     """Configuration-related errors"""
     pass
 
+def compile_template(template: str) -> Callable[..., str]:
+    """Parse a str.format template once, returning a function that fills it from keyword arguments.
+    
+    Templates using format specs, conversions or attribute/index fields fall back to str.format.
+    """
+    pieces = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if literal:
+            pieces.append((literal, None))
+        if field_name is None:
+            continue
+        if format_spec or conversion or not field_name.isidentifier():
+            return template.format
+        pieces.append((None, field_name))
+    
+    def render(**values) -> str:
+        return ''.join([literal if name is None else format(values[name]) for literal, name in pieces])
+    
+    return render
+
 class EnvironmentConfig:
     """Environment-specific configuration management"""
     
@@ -90,6 +111,7 @@ class Config:
         # Cache for loaded provider configurations
         self._provider_cache = {}
         self._default_provider = None
+        self._template_cache: Dict[str, Callable[..., str]] = {}
         
         # Create necessary directories
         self._create_directories()
@@ -208,6 +230,16 @@ class Config:
                                          ext_settings.get('max_retries', config.max_retries)))
         config.user_agent = os.getenv('EXTRACTION_USER_AGENT', 
                                     ext_settings.get('user_agent', config.user_agent))
+        config.max_download_bytes = int(os.getenv('EXTRACTION_MAX_DOWNLOAD_BYTES', 
+                                                ext_settings.get('max_download_bytes', config.max_download_bytes)))
+        config.parallelism = int(os.getenv('EXTRACTION_PARALLELISM', 
+                                         ext_settings.get('parallelism', config.parallelism)))
+        config.cache_size = int(os.getenv('EXTRACTION_CACHE_SIZE', 
+                                        ext_settings.get('cache_size', config.cache_size)))
+        config.cache_ttl = int(os.getenv('EXTRACTION_CACHE_TTL', 
+                                       ext_settings.get('cache_ttl', config.cache_ttl)))
+        config.failure_cache_ttl = int(os.getenv('EXTRACTION_FAILURE_CACHE_TTL', 
+                                               ext_settings.get('failure_cache_ttl', config.failure_cache_ttl)))
         
         return config
     
@@ -243,6 +275,12 @@ class Config:
                                                 bot_settings.get('max_comment_length', config.max_comment_length)))
         config.check_interval = int(os.getenv('BOT_CHECK_INTERVAL', 
                                             reddit_settings.get('check_interval', config.check_interval)))
+        config.min_check_interval = int(os.getenv('BOT_MIN_CHECK_INTERVAL', 
+                                                reddit_settings.get('min_check_interval', config.min_check_interval)))
+        config.max_check_interval = int(os.getenv('BOT_MAX_CHECK_INTERVAL', 
+                                                reddit_settings.get('max_check_interval', config.max_check_interval)))
+        config.check_interval_growth = float(os.getenv('BOT_CHECK_INTERVAL_GROWTH', 
+                                                     reddit_settings.get('check_interval_growth', config.check_interval_growth)))
         config.max_posts_per_check = int(os.getenv('BOT_MAX_POSTS_PER_CHECK', 
                                                  reddit_settings.get('max_posts_per_check', config.max_posts_per_check)))
         
@@ -317,6 +355,13 @@ class Config:
             except Exception:
                 errors.append("Invalid Redis URL")
         
+        # Polling interval validation; a growth of 1 or less would invert the adaptive backoff
+        if self.bot.check_interval_growth <= 1:
+            errors.append(f"check_interval_growth must be greater than 1, got {self.bot.check_interval_growth}")
+        if self.bot.min_check_interval > self.bot.max_check_interval:
+            errors.append(f"min_check_interval ({self.bot.min_check_interval}) must not exceed "
+                          f"max_check_interval ({self.bot.max_check_interval})")
+        
         # Logging configuration validation
         if self.logging.level not in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
             errors.append(f"Invalid log level: {self.logging.level}")
@@ -361,6 +406,18 @@ class Config:
     def check_interval(self) -> int:
         return self.bot.check_interval
     
+    @property
+    def min_check_interval(self) -> int:
+        return self.bot.min_check_interval
+    
+    @property
+    def max_check_interval(self) -> int:
+        return self.bot.max_check_interval
+    
+    @property
+    def check_interval_growth(self) -> float:
+        return self.bot.check_interval_growth
+    
     @property
     def max_posts_per_check(self) -> int:
         return self.bot.max_posts_per_check
@@ -405,6 +462,10 @@ class Config:
     def comment_template(self) -> str:
         return self.bot.comment_template
     
+    @property
+    def continuation_template(self) -> str:
+        return self.bot.continuation_template
+    
     @property
     def youtube_summary_template(self) -> str:
         return self.youtube.summary_template
@@ -413,6 +474,22 @@ class Config:
     def x_twitter_comment_template(self) -> str:
         return self.twitter.comment_template
     
+    @property
+    def youtube_summary_render(self) -> Callable[..., str]:
+        """youtube_summary_template, parsed once: render(title=..., summary=..., url=...)"""
+        return self._compiled_template(self.youtube.summary_template)
+    
+    @property
+    def x_twitter_render(self) -> Callable[..., str]:
+        """x_twitter_comment_template, parsed once: render(author=..., date=..., text=..., media_note=..., url=...)"""
+        return self._compiled_template(self.twitter.comment_template)
+    
+    def _compiled_template(self, template: str) -> Callable[..., str]:
+        render = self._template_cache.get(template)
+        if render is None:
+            render = self._template_cache[template] = compile_template(template)
+        return render
+    
     @property
     def news_domains(self) -> List[str]:
         return self.domains_config.get('news_domains', [])
@@ -433,6 +510,26 @@ class Config:
     def extraction_timeout(self) -> int:
         return self.extraction.timeout
 
+    @property
+    def max_download_bytes(self) -> int:
+        return self.extraction.max_download_bytes
+
+    @property
+    def extraction_parallelism(self) -> int:
+        return self.extraction.parallelism
+
+    @property
+    def article_cache_size(self) -> int:
+        return self.extraction.cache_size
+
+    @property
+    def article_cache_ttl(self) -> int:
+        return self.extraction.cache_ttl
+
+    @property
+    def failure_cache_ttl(self) -> int:
+        return self.extraction.failure_cache_ttl
+
     @property
     def max_article_length(self) -> int:
         return self.extraction.max_article_length
@@ -3,39 +3,75 @@ Processing cycle for the CanillitaBot.
 """
 
 import logging
-from typing import TYPE_CHECKING
-from src.shared.utils import PerformanceLogger, metrics, error_tracker
+import time
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
+from praw.models import Submission
+from src.shared.utils import PerformanceLogger, TTLCache, metrics, error_tracker
 
 if TYPE_CHECKING:
     from src.core.bot import BotManager
 
 logger = logging.getLogger(__name__)
 
+CLEANUP_INTERVAL = 3600  # seconds between maintenance runs
+
+# Cycles a post may raise in before it is given up on, so one bad post cannot pin the cursor
+MAX_POST_ATTEMPTS = 3
+POST_ATTEMPTS_CACHE_SIZE = 1024
+POST_ATTEMPTS_TTL = 2 * 3600  # seconds; posts are only processed within their first hour
+
 class ProcessingCycle:
     def __init__(self, bot_manager: 'BotManager'):
         self.bot_manager = bot_manager
         self.config = bot_manager.config
         self.reddit_client = bot_manager.reddit_client
         self.database = bot_manager.database
+        self.article_extractor = bot_manager.article_extractor
         self.queue_manager = bot_manager.queue_manager
         self.monitor = bot_manager.monitor
         self.submission_handler = bot_manager.submission_handler
+        self._last_cleanup = time.monotonic()
+        # Failed attempts per post ID that raised while being processed
+        self._post_attempts = TTLCache(maxsize=POST_ATTEMPTS_CACHE_SIZE, ttl=POST_ATTEMPTS_TTL)
 
-    def process_cycle(self):
-        """Process one cycle of checking subreddits"""
+    def process_cycle(self) -> int:
+        """Process one cycle of checking subreddits, returning how many new posts it found"""
         with PerformanceLogger("processing_cycle", logger):
             logger.debug("Starting processing cycle")
             
             total_processed = 0
             total_successful = 0
             
-            for subreddit_name in self.config.subreddits:
+            # Parts of long articles that hit the posting limit in earlier cycles
+            self._post_deferred_replies()
+            
+            # Listings are fetched up front so the cycle's article downloads can overlap;
+            # PRAW is not thread-safe, so every Reddit call stays on this thread
+            posts_by_subreddit = {name: self._fetch_posts(name) for name in self.config.subreddits}
+            # One membership query for the whole cycle instead of one per post
+            unprocessed = self.database.filter_unprocessed(
+                [submission.id for posts in posts_by_subreddit.values() for submission in posts]
+            )
+            if unprocessed is None:
+                logger.warning("Processed-post check failed, leaving this cycle's posts for the next one")
+                # Skip everything to avoid duplicate comments, and refetch full listings next time
+                # so the posts skipped now are seen again
+                for subreddit_name in posts_by_subreddit:
+                    self.reddit_client.reset_cursor(subreddit_name)
+                return 0
+            
+            self._prefetch_articles(posts_by_subreddit, unprocessed)
+            
+            for subreddit_name, posts in posts_by_subreddit.items():
                 try:
                     with PerformanceLogger(f"process_subreddit_{subreddit_name}", logger):
-                        processed, successful = self._process_subreddit(subreddit_name)
+                        processed, successful, unhandled = self._process_subreddit(subreddit_name, posts, unprocessed)
                         total_processed += processed
                         total_successful += successful
                     
+                    # Posts that raised are fetched again next cycle; the cursor stops short of them
+                    self.reddit_client.commit_cursor(subreddit_name, unhandled)
+                    
                 except Exception as e:
                     logger.error(f"Error processing subreddit r/{subreddit_name}: {e}")
                     error_tracker.track_error(e, {'subreddit': subreddit_name, 'operation': 'process_subreddit'})
@@ -56,46 +92,104 @@ class ProcessingCycle:
             # Periodic cleanup
             if self._should_cleanup():
                 self._periodic_cleanup()
+            
+            return len(unprocessed)
+
+    def _post_deferred_replies(self):
+        try:
+            resumed = self.reddit_client.post_deferred_replies()
+            if resumed:
+                logger.info(f"Resumed deferred continuation comments on {resumed} post(s)")
+        except Exception as e:
+            logger.error(f"Error posting deferred continuation comments: {e}")
+
+    def _fetch_posts(self, subreddit_name: str) -> List[Submission]:
+        """Fetch the newest posts of a single subreddit; errors are logged and yield no posts"""
+        return list(self.reddit_client.get_new_posts(
+            subreddit_name, 
+            limit=self.config.max_posts_per_check,
+            only_unseen=True
+        ))
 
-    def _process_subreddit(self, subreddit_name: str) -> tuple[int, int]:
-        """Process posts from a single subreddit"""
+    def _prefetch_articles(self, posts_by_subreddit: Dict[str, List[Submission]], unprocessed: Set[str]):
+        """Start downloading the cycle's new article links so they overlap with comment posting"""
+        if self.queue_manager and self.queue_manager.is_available():
+            # Queue workers extract in their own process, so warming this cache would not help them
+            return
+        
+        try:
+            urls = [
+                submission.url
+                for posts in posts_by_subreddit.values()
+                for submission in posts
+                if submission.id in unprocessed
+                and self.reddit_client.is_news_article(submission)
+                and self.reddit_client.validate_submission(submission)
+            ]
+            # Returns immediately; processing waits only for articles still downloading
+            self.article_extractor.prefetch(urls)
+        except Exception as e:
+            # Processing extracts on its own if the prefetch did not get there
+            logger.warning(f"Article prefetch failed: {e}")
+
+    def _process_subreddit(self, subreddit_name: str, posts: List[Submission], unprocessed: Set[str]) -> Tuple[int, int, List[str]]:
+        """Process fetched posts from a single subreddit
+        
+        Returns the processed and successful counts, and the fullnames of posts that raised
+        instead of being recorded or queued and should be fetched again.
+        """
         logger.debug(f"Processing r/{subreddit_name}")
         
         processed_count = 0
         successful_count = 0
+        unhandled = []
         
-        try:
-            posts = list(self.reddit_client.get_new_posts(
-                subreddit_name, 
-                limit=self.config.max_posts_per_check
-            ))
+        for submission in posts:
+            if submission.id not in unprocessed:
+                logger.debug(f"Post {submission.id} already processed, skipping")
+                successful_count += 1
+                processed_count += 1
+                continue
             
-            for submission in posts:
-                try:
-                    if self.submission_handler.process_submission(submission, subreddit_name):
-                        successful_count += 1
-                    processed_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error processing submission {submission.id}: {e}")
-                    processed_count += 1
+            attempts = self._post_attempts.get(submission.id) or 0
+            if attempts >= MAX_POST_ATTEMPTS:
+                logger.debug(f"Post {submission.id} was given up on, skipping")
+                processed_count += 1
+                continue
             
-        except Exception as e:
-            logger.error(f"Error fetching posts from r/{subreddit_name}: {e}")
+            try:
+                if self.submission_handler.process_submission(submission, subreddit_name):
+                    successful_count += 1
+                processed_count += 1
+                
+            except Exception as e:
+                logger.error(f"Error processing submission {submission.id}: {e}")
+                processed_count += 1
+                attempts += 1
+                self._post_attempts.set(submission.id, attempts)
+                if attempts >= MAX_POST_ATTEMPTS:
+                    logger.error(f"Giving up on post {submission.id} after {attempts} failed attempts")
+                else:
+                    unhandled.append(submission.fullname)
         
-        return processed_count, successful_count
+        return processed_count, successful_count, unhandled
 
     def _should_cleanup(self) -> bool:
         """Check if periodic cleanup should run"""
-        # Run cleanup once per hour (roughly)
-        cycles_per_hour = 3600 // self.config.check_interval
-        return hasattr(self.bot_manager, '_cycle_count') and self.bot_manager._cycle_count % cycles_per_hour == 0
+        # Wall-clock based, since the polling interval adapts and cycles have no fixed length
+        return time.monotonic() - self._last_cleanup >= CLEANUP_INTERVAL
 
     def _periodic_cleanup(self):
         """Run periodic maintenance tasks"""
         logger.info("Running periodic cleanup")
+        self._last_cleanup = time.monotonic()
         
         try:
+            # Drop expired extractions so links seen only once do not linger until evicted
+            expired_count = self.article_extractor.expire_cache()
+            if expired_count:
+                logger.info(f"Dropped {expired_count} expired article cache entries")
+            
             # Clean up old database entries
             deleted_count = self.database.cleanup_old_entries()
             
@@ -2,22 +2,47 @@ import sqlite3
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
+from src.shared.utils import TTLCache
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Recently processed post IDs kept in memory; /new listings mostly repeat posts already handled
+PROCESSED_CACHE_SIZE = 4096
+PROCESSED_CACHE_TTL = 24 * 3600  # seconds
+
+# Submissions the bot account replied to, kept apart from processed_posts so a dashboard
+# retry (which deletes the processed row) still cannot produce a second comment
+COMMENTED_RETENTION_DAYS = 7
+
+# Bound on bound parameters per IN (...) query; older SQLite builds cap a statement at 999
+_MAX_QUERY_PARAMS = 500
+
 class Database:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, cache_processed: bool = False):
         self.config = config
         self.db_path = Path(config.database_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Only for a process that owns the polling loop: a row deleted by another process
+        # (e.g. a dashboard retry) would otherwise still read as processed here
+        self._processed_ids = TTLCache(maxsize=PROCESSED_CACHE_SIZE, ttl=PROCESSED_CACHE_TTL) if cache_processed else None
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; NORMAL sync is crash-safe under WAL and skips the fsync on every commit"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
     def _init_database(self):
         """Initialize database and create tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                # WAL persists in the file: the bot, RQ workers and dashboard read while one writes
+                conn.execute('PRAGMA journal_mode=WAL')
+                
                 conn.execute('''
                     CREATE TABLE IF NOT EXISTS processed_posts (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -56,6 +81,13 @@ class Database:
                     CREATE INDEX IF NOT EXISTS idx_subreddit ON processed_posts(subreddit)
                 ''')
                 
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS commented_submissions (
+                        submission_id TEXT PRIMARY KEY,
+                        commented_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
                 conn.commit()
                 logger.info(f"Database initialized at {self.db_path}")
                 
@@ -65,18 +97,59 @@ class Database:
     
     def is_post_processed(self, post_id: str) -> bool:
         """Check if a post has already been processed"""
+        if self._processed_ids is not None and self._processed_ids.get(post_id):
+            return True
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute(
                     'SELECT 1 FROM processed_posts WHERE post_id = ?',
                     (post_id,)
                 )
-                return cursor.fetchone() is not None
+                processed = cursor.fetchone() is not None
+                if processed:
+                    self._remember_processed(post_id)
+                return processed
                 
         except sqlite3.Error as e:
             logger.error(f"Error checking if post {post_id} is processed: {e}")
             return True  # Assume processed to avoid duplicates on error
     
+    def filter_unprocessed(self, post_ids: List[str]) -> Optional[Set[str]]:
+        """Return the subset of post_ids not yet processed, using one query per batch
+        
+        Returns None if the database could not be read; callers must then treat every
+        post as processed for now, to avoid duplicates, and look at them again later.
+        """
+        pending = [post_id for post_id in dict.fromkeys(post_ids)
+                   if self._processed_ids is None or not self._processed_ids.get(post_id)]
+        if not pending:
+            return set()
+        
+        try:
+            processed = set()
+            with self._connect() as conn:
+                for start in range(0, len(pending), _MAX_QUERY_PARAMS):
+                    batch = pending[start:start + _MAX_QUERY_PARAMS]
+                    placeholders = ', '.join('?' * len(batch))
+                    cursor = conn.execute(
+                        f'SELECT post_id FROM processed_posts WHERE post_id IN ({placeholders})',
+                        batch
+                    )
+                    processed.update(row[0] for row in cursor)
+            
+            for post_id in processed:
+                self._remember_processed(post_id)
+            return set(pending) - processed
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error checking processed posts: {e}")
+            return None
+    
+    def _remember_processed(self, post_id: str):
+        if self._processed_ids is not None:
+            self._processed_ids.set(post_id, True)
+    
     def record_processed_post(
         self, 
         post_id: str,
@@ -101,7 +174,7 @@ class Database:
                 article_content_length = len(article_data.get('content', ''))
                 extraction_method = article_data.get('extraction_method', '')
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute('''
                     INSERT OR REPLACE INTO processed_posts (
                         post_id, subreddit, title, url, author, created_utc,
@@ -116,18 +189,46 @@ class Database:
                 conn.commit()
                 
                 logger.debug(f"Recorded processed post {post_id} (success: {success})")
+                self._remember_processed(post_id)
                 return True
                 
         except sqlite3.Error as e:
             logger.error(f"Error recording processed post {post_id}: {e}")
             return False
     
+    def has_commented_on(self, submission_id: str) -> bool:
+        """Check if the bot account is known to have replied to a submission"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    'SELECT 1 FROM commented_submissions WHERE submission_id = ?',
+                    (submission_id,)
+                )
+                return cursor.fetchone() is not None
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error checking comment record for {submission_id}: {e}")
+            return False  # Fall back to asking Reddit
+    
+    def record_comment(self, submission_id: str):
+        """Remember that the bot account replied to a submission"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR IGNORE INTO commented_submissions (submission_id) VALUES (?)',
+                    (submission_id,)
+                )
+                conn.commit()
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error recording comment on {submission_id}: {e}")
+    
     def get_processing_stats(self, days: int = 7) -> Dict[str, Any]:
         """Get processing statistics for the last N days"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Total posts processed
                 cursor = conn.execute('''
                     SELECT COUNT(*) FROM processed_posts 
@@ -179,7 +280,7 @@ class Database:
     def get_recent_posts(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recently processed posts"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row  # Enable dict-like access
                 
                 cursor = conn.execute('''
@@ -199,17 +300,25 @@ class Database:
         try:
             cutoff_date = datetime.now() - timedelta(days=self.config.cleanup_days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute('''
                     DELETE FROM processed_posts 
                     WHERE processed_at < ?
                 ''', (cutoff_date,))
                 
                 deleted_count = cursor.rowcount
+                
+                # Posts are only commented within their first hour, so a week of records is plenty
+                conn.execute('''
+                    DELETE FROM commented_submissions
+                    WHERE commented_at < ?
+                ''', (datetime.now() - timedelta(days=COMMENTED_RETENTION_DAYS),))
                 conn.commit()
                 
                 if deleted_count > 0:
                     logger.info(f"Cleaned up {deleted_count} old database entries")
+                    if self._processed_ids is not None:
+                        self._processed_ids.clear()
                 
                 return deleted_count
                 
@@ -222,7 +331,7 @@ class Database:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 
                 cursor = conn.execute('''
@@ -240,7 +349,7 @@ class Database:
     def vacuum_database(self):
         """Optimize database by running VACUUM"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute('VACUUM')
                 logger.info("Database vacuumed successfully")
                 
@@ -250,7 +359,7 @@ class Database:
     def get_post_details(self, post_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a specific post"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 
                 cursor = conn.execute('''
@@ -268,13 +377,15 @@ class Database:
     def remove_processed_post(self, post_id: str) -> bool:
         """Remove a post from the processed posts table to allow reprocessing"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute('''
                     DELETE FROM processed_posts
                     WHERE post_id = ?
                 ''', (post_id,))
                 
                 deleted_count = cursor.rowcount
+                if self._processed_ids is not None:
+                    self._processed_ids.pop(post_id)
                 logger.info(f"Removed post {post_id} from processed posts (deleted {deleted_count} records)")
                 return deleted_count > 0
                 
@@ -16,6 +16,7 @@ class BotLifecycle:
     def __init__(self, bot_manager: 'BotManager'):
         self.bot_manager = bot_manager
         self.running = False
+        self.current_interval = bot_manager.config.check_interval
         self._setup_signal_handlers()
 
     def _setup_signal_handlers(self):
@@ -31,7 +32,9 @@ class BotLifecycle:
         """Start the bot"""
         logger.info("Starting CanillitaBot - Reddit Argentina News Bot")
         logger.info(f"Monitoring subreddits: {', '.join(self.bot_manager.config.subreddits)}")
-        logger.info(f"Check interval: {self.bot_manager.config.check_interval} seconds")
+        config = self.bot_manager.config
+        logger.info(f"Check interval: {config.check_interval} seconds "
+                    f"(adapts between {config.min_check_interval} and {config.max_check_interval})")
         
         # Start health server
         try:
@@ -48,10 +51,10 @@ class BotLifecycle:
                 # Update health checker activity
                 self.bot_manager.health_checker.update_activity()
                 
-                self.bot_manager.cycle.process_cycle()
+                new_posts = self.bot_manager.cycle.process_cycle()
                 
                 # Sleep with periodic wake-ups to check for shutdown
-                self._interruptible_sleep(self.bot_manager.config.check_interval)
+                self._interruptible_sleep(self._next_interval(new_posts))
                 
         except Exception as e:
             logger.error(f"Unexpected error in main loop: {e}")
@@ -77,7 +80,16 @@ class BotLifecycle:
         # Allow current cycle to complete naturally
         logger.info("Waiting for current processing cycle to complete...")
 
-    def _interruptible_sleep(self, duration: int):
+    def _next_interval(self, new_posts: int) -> float:
+        """Poll faster while posts keep arriving and back off while subreddits are quiet"""
+        config = self.bot_manager.config
+        if new_posts:
+            self.current_interval = max(config.min_check_interval, self.current_interval / config.check_interval_growth)
+        else:
+            self.current_interval = min(config.max_check_interval, self.current_interval * config.check_interval_growth)
+        return self.current_interval
+
+    def _interruptible_sleep(self, duration: float):
         """Sleep that can be interrupted for faster shutdown"""
         sleep_interval = min(1, duration)  # Sleep in 1-second intervals
         total_slept = 0
@@ -92,6 +104,7 @@ class BotLifecycle:
         
         cleanup_tasks = [
             ('health_server', lambda: self.bot_manager.health_server.stop() if self.bot_manager.health_server else None),
+            ('article_extractor', lambda: self.bot_manager.article_extractor.close() if hasattr(self.bot_manager, 'article_extractor') else None),
             ('database', lambda: self.bot_manager.database.close() if hasattr(self.bot_manager, 'database') else None),
             ('queue_manager', lambda: self.bot_manager.queue_manager.close() if hasattr(self.bot_manager, 'queue_manager') and self.bot_manager.queue_manager else None)
         ]
@@ -3,20 +3,22 @@ Content processing logic for the CanillitaBot.
 """
 
 import logging
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional
 from praw.models import Submission
 from src.core.config import Config
 from src.core.database import Database
 from src.clients.reddit import RedditClient
 from src.extractors.article import ArticleExtractor
-from src.clients.gemini import GeminiClient
 from src.extractors.x import XContentExtractor
 
+if TYPE_CHECKING:
+    from src.clients.gemini import GeminiClient
+
 logger = logging.getLogger(__name__)
 
 class ContentProcessor:
     def __init__(self, config: Config, database: Database, reddit_client: RedditClient,
-                 article_extractor: ArticleExtractor, gemini_client: GeminiClient,
+                 article_extractor: ArticleExtractor, gemini_client: Optional['GeminiClient'],
                  x_extractor: XContentExtractor):
         self.config = config
         self.database = database
@@ -24,46 +26,55 @@ class ContentProcessor:
         self.article_extractor = article_extractor
         self.gemini_client = gemini_client
         self.x_extractor = x_extractor
+        
+        # Handlers by content type; disabled types have none, so their posts are skipped
+        self._handlers: Dict[str, Callable[[Submission, str], bool]] = {'article': self._process_news_article}
+        if self.config.youtube_enabled and self.gemini_client:
+            self._handlers['youtube'] = self._process_youtube_video
+        if self.config.x_twitter_enabled and self.x_extractor:
+            self._handlers['twitter'] = self._process_x_twitter_post
+
+    def record_outcome(self, submission: Submission, subreddit_name: str, success: bool,
+                       error_message: Optional[str] = None, **details) -> bool:
+        """Records how processing a submission ended; every path records exactly once."""
+        return self.database.record_processed_post(
+            post_id=submission.id,
+            subreddit=subreddit_name,
+            title=submission.title,
+            url=getattr(submission, 'url', ''),
+            author=submission.author.name if submission.author else '[deleted]',
+            created_utc=submission.created_utc,
+            success=success,
+            error_message=error_message,
+            **details
+        )
 
     def process_submission(self, submission: Submission, subreddit_name: str) -> bool:
         """Processes a single submission."""
-        post_id = submission.id
-
-        if not self.reddit_client.is_news_article(submission):
-            if self.config.youtube_enabled and self.gemini_client and self.reddit_client.is_youtube_video(submission):
-                logger.info(f"Processing YouTube video: {submission.title[:50]}...")
-                return self._process_youtube_video(submission, subreddit_name)
-            
-            if self.config.x_twitter_enabled and self.x_extractor and self.reddit_client.is_x_twitter_post(submission):
-                logger.info(f"Processing X/Twitter post: {submission.title[:50]}...")
-                return self._process_x_twitter_post(submission, subreddit_name)
-            
-            logger.debug(f"Post {post_id} is not a news article, YouTube video, or X/Twitter post, skipping")
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=submission.url,
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
-                success=False,
-                error_message="Not a news article, YouTube video, or X/Twitter post"
-            )
-            return False
+        # One classification per submission instead of a predicate per content type
+        handler = self._handlers.get(self.reddit_client.classify_submission(submission))
+        if handler:
+            return handler(submission, subreddit_name)
         
+        logger.debug(f"Post {submission.id} is not a news article, YouTube video, or X/Twitter post, skipping")
+        self.record_outcome(
+            submission, subreddit_name,
+            success=False,
+            error_message="Not a news article, YouTube video, or X/Twitter post"
+        )
+        return False
+
+    def _process_news_article(self, submission: Submission, subreddit_name: str) -> bool:
+        """Processes a news article submission."""
+        post_id = submission.id
         logger.info(f"Processing news article: {submission.title[:50]}...")
         
         article_data = self.article_extractor.extract_with_retry(submission.url)
         
         if not article_data:
             logger.warning(f"Failed to extract content from {submission.url}")
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=submission.url,
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
+            self.record_outcome(
+                submission, subreddit_name,
                 success=False,
                 error_message="Article extraction failed"
             )
@@ -80,13 +91,8 @@ class ContentProcessor:
         # Join multiple comments with separator for storage
         comment_content_for_db = "\n\n---\n\n".join(formatted_comments) if formatted_comments else None
         
-        self.database.record_processed_post(
-            post_id=post_id,
-            subreddit=subreddit_name,
-            title=submission.title,
-            url=submission.url,
-            author=submission.author.name if submission.author else '[deleted]',
-            created_utc=submission.created_utc,
+        self.record_outcome(
+            submission, subreddit_name,
             success=comment_success,
             error_message="Comment posting failed" if not comment_success else None,
             article_data=article_data,
@@ -103,11 +109,12 @@ class ContentProcessor:
     def _process_youtube_video(self, submission: Submission, subreddit_name: str) -> bool:
         """Processes a YouTube video submission."""
         post_id = submission.id
+        logger.info(f"Processing YouTube video: {submission.title[:50]}...")
         
         try:
             video_data = self.gemini_client.summarize_youtube_video(submission.url)
             
-            formatted_comment = self.config.youtube_summary_template.format(
+            formatted_comment = self.config.youtube_summary_render(
                 title=video_data['title'],
                 summary=video_data['summary'],
                 url=submission.url
@@ -115,13 +122,8 @@ class ContentProcessor:
             
             comment_success = self.reddit_client.post_comment(submission, formatted_comment)
             
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=submission.url,
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
+            self.record_outcome(
+                submission, subreddit_name,
                 success=comment_success,
                 error_message=None if comment_success else "Comment posting failed",
                 comment_content=formatted_comment if comment_success else None
@@ -137,13 +139,8 @@ class ContentProcessor:
         except Exception as e:
             logger.error(f"Error processing YouTube video {post_id}: {e}")
             
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=submission.url,
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
+            self.record_outcome(
+                submission, subreddit_name,
                 success=False,
                 error_message=f"YouTube processing failed: {str(e)}"
             )
@@ -153,19 +150,15 @@ class ContentProcessor:
     def _process_x_twitter_post(self, submission: Submission, subreddit_name: str) -> bool:
         """Processes an X/Twitter post submission."""
         post_id = submission.id
+        logger.info(f"Processing X/Twitter post: {submission.title[:50]}...")
         
         try:
             tweet_data = self.x_extractor.extract_tweet_content(submission.url)
             
             if not tweet_data:
                 logger.warning(f"Failed to extract X/Twitter content from {submission.url}")
-                self.database.record_processed_post(
-                    post_id=post_id,
-                    subreddit=subreddit_name,
-                    title=submission.title,
-                    url=submission.url,
-                    author=submission.author.name if submission.author else '[deleted]',
-                    created_utc=submission.created_utc,
+                self.record_outcome(
+                    submission, subreddit_name,
                     success=False,
                     error_message="X/Twitter content extraction failed"
                 )
@@ -175,7 +168,7 @@ class ContentProcessor:
             if tweet_data.get('media_count', 0) > 0:
                 media_note = f"📎 *Contiene {tweet_data['media_count']} archivo(s) multimedia*"
             
-            formatted_comment = self.config.x_twitter_comment_template.format(
+            formatted_comment = self.config.x_twitter_render(
                 author=tweet_data['author'],
                 date=tweet_data['date'],
                 text=tweet_data['text'],
@@ -185,13 +178,8 @@ class ContentProcessor:
             
             comment_success = self.reddit_client.post_comment(submission, formatted_comment)
             
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=submission.url,
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
+            self.record_outcome(
+                submission, subreddit_name,
                 success=comment_success,
                 error_message=None if comment_success else "Comment posting failed",
                 comment_content=formatted_comment if comment_success else None
@@ -207,13 +195,8 @@ class ContentProcessor:
         except Exception as e:
             logger.error(f"Error processing X/Twitter post {post_id}: {e}")
             
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=submission.url,
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
+            self.record_outcome(
+                submission, subreddit_name,
                 success=False,
                 error_message=f"X/Twitter processing failed: {str(e)}"
             )
@@ -52,6 +52,11 @@ class ExtractionConfig:
     extraction_user_agent: str = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
     max_article_length: int = 50000
     min_article_length: int = 200
+    max_download_bytes: int = 2 * 1024 * 1024  # HTML read per page; the rest is discarded
+    parallelism: int = 8  # concurrent downloads when extracting a batch of URLs
+    cache_size: int = 2048  # recently extracted articles kept in memory
+    cache_ttl: int = 3600  # seconds
+    failure_cache_ttl: int = 300  # seconds a URL that exhausted its retries is skipped
 
 @dataclass
 class YouTubeConfig:
@@ -101,6 +106,10 @@ class BotConfig:
     continuation_template: str = "{content}"
     max_comment_length: int = 10000
     check_interval: int = 30
+    # Polling adapts between these bounds: faster while new posts keep arriving, slower when idle
+    min_check_interval: int = 15
+    max_check_interval: int = 120
+    check_interval_growth: float = 2.0
     max_posts_per_check: int = 10
 
 @dataclass
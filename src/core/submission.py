@@ -34,13 +34,8 @@ class SubmissionHandler:
         # Validate submission
         if not self.reddit_client.validate_submission(submission):
             logger.debug(f"Post {post_id} failed validation, skipping")
-            self.database.record_processed_post(
-                post_id=post_id,
-                subreddit=subreddit_name,
-                title=submission.title,
-                url=getattr(submission, 'url', ''),
-                author=submission.author.name if submission.author else '[deleted]',
-                created_utc=submission.created_utc,
+            self.processor.record_outcome(
+                submission, subreddit_name,
                 success=False,
                 error_message="Failed validation"
             )
@@ -90,11 +85,4 @@ class SubmissionHandler:
 
     def _determine_content_type(self, submission: Submission) -> str:
         """Determine the content type of a submission"""
-        if self.reddit_client.is_news_article(submission):
-            return 'article'
-        elif self.reddit_client.is_youtube_video(submission):
-            return 'youtube'
-        elif self.reddit_client.is_x_twitter_post(submission):
-            return 'twitter'
-        else:
-            return 'unknown'
+        return self.reddit_client.classify_submission(submission) or 'unknown'
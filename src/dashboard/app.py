@@ -97,7 +97,7 @@ class CanillitaDashboard:
         # Initialize components
         self.config = Config()
         self.database = Database(self.config)
-        self.reddit_client = RedditClient(self.config)
+        self.reddit_client = RedditClient(self.config, self.database)
         
         # Initialize queue manager if available (needed for fetch new posts)
         self.queue_manager = None
@@ -1,22 +1,167 @@
 import logging
+import random
+import threading
 import time
-from typing import Optional, Dict, Any
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Optional, Dict, Any, List, Tuple
 from src.core.config import Config
+from src.shared.utils import TTLCache, canonicalize_url
 from src.extractors.providers import get_provider
+from src.extractors.http import create_session, HostLimiter
 
 logger = logging.getLogger(__name__)
 
+# Retry backoff bounds in seconds
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 30
+
 class ArticleExtractor:
     def __init__(self, config: Config):
         self.config = config
+        # One pooled session shared by every provider keeps connections alive across articles;
+        # its per-host pool is sized to the batch parallelism so no worker opens a throwaway connection
+        self.parallelism = max(1, config.extraction_parallelism)
+        self.session = create_session(config.extraction_user_agent, pool_maxsize=self.parallelism)
+        # Shared news CDNs rate-limit aggressively, so each host gets its own adaptive cap
+        self.host_limiter = HostLimiter()
+        self.session.hooks['response'].append(self.host_limiter.observe)
+        # Recently extracted articles, so cross-posts of the same link are not downloaded again
+        self.cache = TTLCache(maxsize=config.article_cache_size, ttl=config.article_cache_ttl)
+        # Links that failed every retry; kept briefly so a dead URL is not hammered on each mention
+        self.failures = TTLCache(maxsize=config.article_cache_size, ttl=config.failure_cache_ttl)
+        # Extractions in progress, so a URL requested again while downloading is not fetched twice
+        self._pending: Dict[str, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._prefetcher = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="prefetch")
 
     def extract_article(self, url: str) -> Optional[Dict[str, Any]]:
         """Extract article content from URL using the appropriate provider."""
-        provider = get_provider(self.config, url)
-        return provider.extract_article(url)
+        # The canonical URL is the cache key, so tracking variants share one entry
+        url = canonicalize_url(url)
+        cached = self.cache.get(url)
+        if cached is not None:
+            logger.debug(f"Using cached extraction for {url}")
+            return self._from_cache_entry(cached)
+        
+        provider = get_provider(self.config, url, session=self.session)
+        with self.host_limiter.slot(url):
+            result = provider.extract_article(url)
+        if result:
+            self.cache.set(url, self._to_cache_entry(result))
+        return result
+
+    def clear_cache(self):
+        """Forget previously extracted articles and failed links"""
+        self.cache.clear()
+        self.failures.clear()
+
+    def expire_cache(self) -> int:
+        """Drop expired articles and failed links, returning how many were removed"""
+        return self.cache.expire() + self.failures.expire()
+
+    @staticmethod
+    def _to_cache_entry(article: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores the body as UTF-8 bytes; curly quotes and dashes would otherwise widen the str to 2 bytes per char."""
+        content = article.get('content')
+        if isinstance(content, str):
+            return {**article, 'content': content.encode('utf-8')}
+        return dict(article)
+
+    @staticmethod
+    def _from_cache_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        content = entry.get('content')
+        if isinstance(content, bytes):
+            return {**entry, 'content': content.decode('utf-8')}
+        return dict(entry)
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with full jitter so concurrent retries do not hit a host in lockstep."""
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+    def _claim(self, url: str) -> Tuple[Future, bool]:
+        """Returns the pending extraction for a canonical URL and whether the caller must run it"""
+        with self._pending_lock:
+            pending = self._pending.get(url)
+            if pending is not None:
+                return pending, False
+            pending = self._pending[url] = Future()
+            return pending, True
+
+    def _run_claimed(self, url: str, pending: Future) -> Optional[Dict[str, Any]]:
+        try:
+            result = self._extract_with_retry(url)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            with self._pending_lock:
+                self._pending.pop(url, None)
+
+    def _abandon(self, url: str, pending: Future):
+        """Releases a claim whose extraction will never run; waiters then extract the URL themselves"""
+        pending.cancel()
+        with self._pending_lock:
+            if self._pending.get(url) is pending:
+                del self._pending[url]
+
+    def _abandon_if_cancelled(self, url: str, pending: Future, task: Future):
+        if task.cancelled():
+            self._abandon(url, pending)
+
+    def prefetch(self, urls: List[str]):
+        """Start extracting URLs in the background; extract_with_retry picks up their results."""
+        for url in dict.fromkeys(map(canonicalize_url, urls)):
+            if self.cache.get(url) is not None or self.failures.get(url):
+                continue
+            pending, owner = self._claim(url)
+            if not owner:
+                continue
+            try:
+                task = self._prefetcher.submit(self._run_claimed, url, pending)
+            except RuntimeError:
+                # The pool was shut down by close()
+                self._abandon(url, pending)
+                continue
+            # close() cancels tasks that have not started; their claims must not stay pending
+            task.add_done_callback(partial(self._abandon_if_cancelled, url, pending))
+
+    def close(self):
+        """Stop background prefetching"""
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
 
     def extract_with_retry(self, url: str) -> Optional[Dict[str, Any]]:
         """Extract article with retry logic"""
+        url = canonicalize_url(url)
+        if self.failures.get(url):
+            logger.debug(f"Skipping recently failed extraction for {url}")
+            return None
+        
+        while True:
+            pending, owner = self._claim(url)
+            if owner:
+                return self._run_claimed(url, pending)
+            
+            logger.debug(f"Waiting for in-flight extraction of {url}")
+            try:
+                result = pending.result(timeout=self._wait_timeout())
+            except CancelledError:
+                # A prefetch was abandoned before it ran; claim the URL again
+                continue
+            except FutureTimeoutError:
+                logger.error(f"Timed out waiting for in-flight extraction of {url}")
+                return None
+            return dict(result) if result else result
+
+    def _wait_timeout(self) -> float:
+        """Upper bound on one extraction: every attempt timing out plus the longest backoff between them"""
+        return self.config.max_retries * (self.config.extraction_timeout + RETRY_MAX_DELAY)
+
+    def _extract_with_retry(self, url: str) -> Optional[Dict[str, Any]]:
         for attempt in range(self.config.max_retries):
             try:
                 result = self.extract_article(url)
@@ -27,7 +172,25 @@ class ArticleExtractor:
                 logger.warning(f"Extraction attempt {attempt + 1} failed for {url}: {e}")
                 
             if attempt < self.config.max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
+                time.sleep(self._backoff_delay(attempt))
         
         logger.error(f"Failed to extract article after {self.config.max_retries} attempts: {url}")
+        self.failures.set(url, True)
         return None
+
+    def extract_many(self, urls: List[str], max_workers: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Extract several articles concurrently, returning results keyed by URL.
+
+        Extraction is dominated by network I/O, so downloads overlap in a thread
+        pool and the batch takes roughly as long as its slowest URL. Requests to
+        any single host are still bounded by the adaptive per-host limit. Worker
+        count defaults to, and is capped by, the configured extraction parallelism.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return {}
+
+        workers = max(1, min(max_workers or self.parallelism, self.parallelism, len(unique_urls)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extractor") as executor:
+            results = executor.map(self.extract_with_retry, unique_urls)
+            return dict(zip(unique_urls, results))
@@ -3,37 +3,57 @@ Content formatting and cleanup utilities for article extraction.
 """
 
 import re
-from typing import List
+from functools import lru_cache
+from typing import Match, Optional, Pattern, Tuple
 from bs4 import BeautifulSoup, Tag
+from soupsieve import SoupSieve
 
-def process_article_structure(container: Tag, include_elements: List[str]) -> str:
+# Boilerplate snippets (share buttons, metadata labels) that are not article text
+_UNWANTED_TEXT_PATTERNS = [
+    r'compartir\s*$',
+    r'seguir\s*$',
+    r'tags?[:.]',
+    r'autor[:.]',
+    r'fecha[:.]',
+    r'fuente[:.]',
+]
+_UNWANTED_TEXT_RE = re.compile(r'\s*(?:' + '|'.join(_UNWANTED_TEXT_PATTERNS) + ')', re.IGNORECASE)
+
+_HEADING_PREFIXES = {'h1': '# ', 'h2': '## ', 'h3': '### '}
+
+_HORIZONTAL_SPACE_RE = re.compile(r'[ \t]+')
+# Both folds in one scan; a paragraph gap always starts with a newline, a space run never does
+_WHITESPACE_FOLD_RE = re.compile(r'\n\s*\n\s*\n|[ \t]+')
+
+def _fold_whitespace(match: Match) -> str:
+    return '\n\n' if match.group()[0] == '\n' else ' '
+
+@lru_cache(maxsize=64)
+def _compile_cleanup_patterns(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """Fuses a provider's cleanup patterns into one alternation so content is scanned once."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.I | re.MULTILINE)
+
+def process_article_structure(container: Tag, include_selector: SoupSieve) -> str:
     """Processes the structure of an article container into a formatted string."""
     structured_parts = []
     
-    selector = ", ".join(include_elements)
-    elements = container.select(selector)
+    elements = include_selector.select(container)
     
     for element in elements:
-        if not _is_meaningful_element(element):
-            continue
-            
+        # Each get_text() walks the subtree, so compute it once per element
         text = element.get_text().strip()
-        if not text:
+        if not _is_meaningful_text(text):
             continue
         
-        if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            level = int(element.name[1])
-            if level == 1:
-                structured_parts.append(f"# {text}\n")
-            elif level == 2:
-                structured_parts.append(f"## {text}\n")
-            elif level == 3:
-                structured_parts.append(f"### {text}\n")
-            else:
-                structured_parts.append(f"**{text}**\n")
+        if element.name in _HEADING_PREFIXES:
+            structured_parts.append(f"{_HEADING_PREFIXES[element.name]}{text}")
+        elif element.name in ('h4', 'h5', 'h6'):
+            structured_parts.append(f"**{text}**")
         
         elif element.name == 'p':
-            structured_parts.append(f"{text}\n")
+            structured_parts.append(text)
         
         elif element.name in ['ul', 'ol']:
             list_items = []
@@ -46,14 +66,15 @@ def process_article_structure(container: Tag, include_elements: List[str]) -> st
                         list_items.append(f"{len(list_items) + 1}. {li_text}")
             
             if list_items:
-                structured_parts.append('\n'.join(list_items) + '\n')
+                structured_parts.append('\n'.join(list_items))
         
         elif element.name == 'blockquote':
-            structured_parts.append(f"> {text}\n")
+            structured_parts.append(f"> {text}")
     
-    content = '\n'.join(structured_parts).strip()
-    content = re.sub(r'\n{3,}', '\n\n', content)
-    content = re.sub(r'[ \t]+', ' ', content)
+    # Blocks are separated explicitly; runs of blank lines inside element text
+    # are folded later by final_content_cleanup
+    content = '\n\n'.join(structured_parts)
+    content = _HORIZONTAL_SPACE_RE.sub(' ', content)
     return content.strip()
 
 def final_content_cleanup(content: str, provider_config: dict) -> str:
@@ -61,42 +82,26 @@ def final_content_cleanup(content: str, provider_config: dict) -> str:
     if not content:
         return ""
     
-    cleanup_patterns = provider_config.get('cleanup_patterns', [])
-    
-    for pattern in cleanup_patterns:
-        content = re.sub(pattern, '', content, flags=re.I | re.MULTILINE)
+    cleanup_re = _compile_cleanup_patterns(tuple(provider_config.get('cleanup_patterns', [])))
+    if cleanup_re:
+        content = cleanup_re.sub('', content)
     
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-    content = re.sub(r'[ \t]+', ' ', content)
-    content = content.strip()
+    content = _WHITESPACE_FOLD_RE.sub(_fold_whitespace, content).strip()
     
     max_length = provider_config.get('content', {}).get('max_length', 50000)
     if len(content) > max_length:
-        content = content[:max_length]
-        last_sentence = max(content.rfind('.'), content.rfind('\n\n'))
-        if last_sentence > max_length * 0.8:
-            content = content[:last_sentence + 1]
+        # Only a break in the last 20% is acceptable, so never search before it; bounding
+        # the search at max_length avoids slicing out a max-length intermediate first
+        window_start = int(max_length * 0.8) + 1
+        last_sentence = max(content.rfind('.', window_start, max_length),
+                            content.rfind('\n\n', window_start, max_length))
+        content = content[:last_sentence + 1] if last_sentence != -1 else content[:max_length]
     
     return content
 
-def _is_meaningful_element(element: Tag) -> bool:
-    """Checks if an element contains meaningful text."""
-    text = element.get_text().strip()
-    
+def _is_meaningful_text(text: str) -> bool:
+    """Checks if an element's stripped text is meaningful."""
     if not text or len(text) < 5:
         return False
     
-    unwanted_patterns = [
-        r'^\s*compartir\s*$',
-        r'^\s*seguir\s*$',
-        r'^\s*tags?[:.]',
-        r'^\s*autor[:.]',
-        r'^\s*fecha[:.]',
-        r'^\s*fuente[:.]',
-    ]
-    
-    for pattern in unwanted_patterns:
-        if re.match(pattern, text.lower()):
-            return False
-    
-    return True
+    return not _UNWANTED_TEXT_RE.match(text)
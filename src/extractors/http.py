@@ -0,0 +1,174 @@
+"""
+Shared HTTP session for article extraction.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from email.message import Message
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Largest HTML body read from a response; article text lives well within this
+MAX_HTML_BYTES = 2 * 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+# Distinct hosts whose connection pools stay cached; evicted pools reconnect and re-resolve DNS
+MAX_HOST_POOLS = 64
+
+# Per-host concurrency bounds and the longest Retry-After we are willing to honour
+HOST_INITIAL_LIMIT = 4
+HOST_MAX_LIMIT = 8
+HOST_INCREASE_AFTER = 10  # consecutive successes before a host gets one more slot
+MAX_RETRY_AFTER = 60  # seconds
+# Hosts whose limits are remembered; idle ones beyond this are forgotten, least recently used first
+MAX_TRACKED_HOSTS = 256
+
+def create_session(user_agent: str, pool_maxsize: int = 10) -> requests.Session:
+    """Creates a session whose keep-alive connections are reused across articles."""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': user_agent
+    })
+
+    adapter = HTTPAdapter(pool_connections=MAX_HOST_POOLS, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _declared_charset(content_type: str) -> Optional[str]:
+    """Charset given explicitly in a Content-Type header; requests' ISO-8859-1 default for text/* is wrong for most sites"""
+    if not content_type:
+        return None
+    header = Message()
+    header['Content-Type'] = content_type
+    return header.get_content_charset()
+
+def fetch_html(session: requests.Session, url: str, timeout: int, max_bytes: int = MAX_HTML_BYTES) -> Tuple[bytes, Optional[str]]:
+    """Streams an HTML page, stopping at max_bytes and rejecting non-HTML responses before download.
+    
+    Returns the body together with the charset declared in the Content-Type header, if any.
+    """
+    with session.get(url, timeout=timeout, stream=True, allow_redirects=True) as response:
+        response.raise_for_status()
+        
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type.lower():
+            raise ValueError(f"Unsupported content type '{content_type}'")
+        
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+            body += chunk
+            if len(body) >= max_bytes:
+                logger.debug(f"Truncated {url} at {max_bytes} bytes")
+                break
+        
+        return bytes(body[:max_bytes]), _declared_charset(content_type)
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+def _requested_host(response: requests.Response) -> str:
+    """Host the caller asked for, which is what HostLimiter.slot() was keyed on, even after redirects"""
+    first = response.history[0] if response.history else response
+    return _host(first.url)
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return 0.0
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return 0.0
+    return max(0.0, min(delay, MAX_RETRY_AFTER))
+
+class HostLimiter:
+    """Caps concurrent requests per host, shrinking the cap on 429s and growing it back on success (AIMD)."""
+    
+    def __init__(self, initial_limit: int = HOST_INITIAL_LIMIT, max_limit: int = HOST_MAX_LIMIT,
+                 increase_after: int = HOST_INCREASE_AFTER, max_hosts: int = MAX_TRACKED_HOSTS):
+        self.initial_limit = initial_limit
+        self.max_limit = max_limit
+        self.increase_after = increase_after
+        self.max_hosts = max_hosts
+        self._cond = threading.Condition()
+        self._hosts: OrderedDict[str, Dict[str, float]] = OrderedDict()
+    
+    def _state(self, host: str) -> Dict[str, float]:
+        state = self._hosts.get(host)
+        if state is None:
+            self._evict_idle()
+            state = {'limit': self.initial_limit, 'active': 0, 'successes': 0, 'blocked_until': 0.0}
+            self._hosts[host] = state
+        else:
+            self._hosts.move_to_end(host)
+        return state
+    
+    def _evict_idle(self):
+        """Makes room for a new host by forgetting hosts with no request in flight and no backoff pending"""
+        if len(self._hosts) < self.max_hosts:
+            return
+        now = time.monotonic()
+        idle = [host for host, state in self._hosts.items()
+                if state['active'] == 0 and state['blocked_until'] <= now]
+        for host in idle[:len(self._hosts) - self.max_hosts + 1]:
+            del self._hosts[host]
+    
+    def __len__(self) -> int:
+        return len(self._hosts)
+    
+    def limit(self, host: str) -> int:
+        with self._cond:
+            return int(self._state(host)['limit'])
+    
+    @contextmanager
+    def slot(self, url: str):
+        """Holds one of the host's slots for the duration of the block"""
+        host = _host(url)
+        with self._cond:
+            state = self._state(host)
+            while True:
+                wait = state['blocked_until'] - time.monotonic()
+                if wait <= 0 and state['active'] < state['limit']:
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            state['active'] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                state['active'] -= 1
+                self._cond.notify_all()
+    
+    def observe(self, response: requests.Response, *args, **kwargs):
+        """Session response hook feeding status codes back into the per-host limits"""
+        if response.is_redirect:
+            # The hook also sees each hop of a redirect; only the final response is an outcome
+            return
+        
+        host = _requested_host(response)
+        with self._cond:
+            state = self._state(host)
+            if response.status_code == 429:
+                state['limit'] = max(1, state['limit'] // 2)
+                state['successes'] = 0
+                delay = _parse_retry_after(response.headers.get('Retry-After'))
+                state['blocked_until'] = max(state['blocked_until'], time.monotonic() + delay)
+                logger.warning(f"Rate limited by {_host(response.url)} (requested as {host}), limit now {state['limit']}")
+            elif response.status_code < 400:
+                state['successes'] += 1
+                if state['successes'] >= self.increase_after and state['limit'] < self.max_limit:
+                    state['limit'] += 1
+                    state['successes'] = 0
+            self._cond.notify_all()
@@ -6,10 +6,10 @@ PROVIDER_MAPPING = {
     "infobae.com": InfobaeProvider,
 }
 
-def get_provider(config, url: str):
+def get_provider(config, url: str, session=None):
     domain = urlparse(url).netloc
     if domain.startswith("www."):
         domain = domain[4:]
 
     provider_class = PROVIDER_MAPPING.get(domain, DefaultProvider)
-    return provider_class(config)
+    return provider_class(config, session=session)
@@ -3,8 +3,9 @@ from typing import Optional, Dict, Any, List
 from bs4 import BeautifulSoup
 
 class BaseProvider(ABC):
-    def __init__(self, config):
+    def __init__(self, config, session=None):
         self.config = config
+        self.session = session
 
     @abstractmethod
     def extract_article(self, url: str) -> Optional[Dict[str, Any]]:
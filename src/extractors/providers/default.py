@@ -1,21 +1,188 @@
-import requests
+import json
 import logging
 import re
-from typing import Optional, Dict, Any, List
-from bs4 import BeautifulSoup, Tag
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, Any, Callable, Iterator, List, Pattern, Tuple
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from newspaper import Article
 from src.extractors.providers.base import BaseProvider
+from src.extractors.http import create_session, fetch_html
 from src.extractors.formatters import process_article_structure, final_content_cleanup
 
 logger = logging.getLogger(__name__)
 
+# Prefix sizes used by the duplicate-line and word-diversity checks
+QUALITY_SAMPLE_LINES = 200
+QUALITY_SAMPLE_WORDS = 2000
+
+# C-backed tree builder; lxml is already a hard dependency through newspaper3k
+_PARSER = 'lxml'
+
+def _is_article_markup(name: str, attrs: Dict[str, str]) -> bool:
+    """Top-level tags worth building: the body plus the head metadata used for title, date and JSON-LD"""
+    if name in ('body', 'title', 'meta'):
+        return True
+    return name == 'script' and attrs.get('type') == 'application/ld+json'
+
+# bs4 strains only top-level tags, so this skips head scripts, styles and links without touching the body
+_ARTICLE_STRAINER = SoupStrainer(_is_article_markup)
+
+def _make_soup(markup, encoding: Optional[str] = None) -> BeautifulSoup:
+    # A known encoding spares bs4 from running charset detection over the whole document
+    soup = BeautifulSoup(markup, _PARSER, from_encoding=encoding, parse_only=_ARTICLE_STRAINER)
+    if soup.body is None:
+        # Malformed or body-less documents: fall back to building the whole tree
+        soup = BeautifulSoup(markup, _PARSER, from_encoding=encoding)
+    return soup
+
+@lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compiles a CSS selector once so repeated articles skip re-parsing it."""
+    return soupsieve.compile(selector)
+
+def _compile_alternation(patterns: List[str], flags: int) -> Optional[Pattern]:
+    """Joins a provider's patterns into one alternation so the tree or text is scanned once."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
+
+def _class_matcher(patterns: List[str]) -> Optional[Callable[[Optional[str]], bool]]:
+    """Builds a class_ filter where plain names are substring checks and only real regexes hit the regex engine."""
+    literals = tuple(p.lower() for p in patterns if re.escape(p) == p)
+    regex = _compile_alternation([p for p in patterns if re.escape(p) != p], re.I)
+    if not literals and not regex:
+        return None
+    
+    def matches(value: Optional[str]) -> bool:
+        if not value:
+            return False
+        lowered = value.lower()
+        return any(literal in lowered for literal in literals) or bool(regex and regex.search(value))
+    
+    return matches
+
+@dataclass
+class CompiledProvider:
+    """Selectors and regexes derived from one provider config"""
+    include_elements: soupsieve.SoupSieve
+    remove_elements: Optional[soupsieve.SoupSieve]
+    remove_classes: Optional[Callable[[Optional[str]], bool]]
+    title_cleanup_res: List[Pattern]
+    reject_re: Optional[Pattern]
+
+# Config hands out the same dict for a domain every time, so bundles are keyed on identity;
+# the config is kept alongside so a recycled id can never match a different dict
+_MAX_COMPILED_PROVIDERS = 64
+_compiled_providers: Dict[int, Tuple[Dict[str, Any], CompiledProvider]] = {}
+
+def _compile_provider(provider_config: Dict[str, Any]) -> CompiledProvider:
+    entry = _compiled_providers.get(id(provider_config))
+    if entry is not None and entry[0] is provider_config:
+        return entry[1]
+    
+    include_elements = provider_config.get('content', {}).get('include_elements', ['p', 'h2', 'h3', 'h4', 'h5', 'h6'])
+    remove_elements = provider_config.get('remove_elements', [])
+    compiled = CompiledProvider(
+        include_elements=_compile_selector(', '.join(include_elements)),
+        remove_elements=_compile_selector(', '.join(remove_elements)) if remove_elements else None,
+        remove_classes=_class_matcher(provider_config.get('remove_classes', [])),
+        title_cleanup_res=[re.compile(p, re.I) for p in provider_config.get('title', {}).get('cleanup_patterns', [])],
+        reject_re=_compile_alternation(provider_config.get('quality', {}).get('reject_if_contains', []), re.I | re.MULTILINE),
+    )
+    
+    if len(_compiled_providers) >= _MAX_COMPILED_PROVIDERS:
+        _compiled_providers.clear()
+    _compiled_providers[id(provider_config)] = (provider_config, compiled)
+    return compiled
+
+def _first_matches(soup: BeautifulSoup, selectors: List[str]) -> Iterator[Tag]:
+    """Yields the first match of each selector in priority order, using a single tree walk."""
+    if not selectors:
+        return
+    
+    candidates = _compile_selector(', '.join(selectors)).select(soup)
+    for selector in selectors:
+        compiled = _compile_selector(selector)
+        for element in candidates:
+            if compiled.match(element):
+                yield element
+                break
+
+def _select_first(soup: BeautifulSoup, selectors: List[str]) -> Optional[Tag]:
+    """Returns the first match of the highest-priority selector using a single tree walk."""
+    return next(_first_matches(soup, selectors), None)
+
+def _decompose_all(elements: List[Tag]):
+    for element in elements:
+        # Matches nested inside an already removed ancestor went with it
+        if not element.decomposed:
+            element.decompose()
+
+def _find_json_ld_article(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+    """Returns the first schema.org *Article object embedded as JSON-LD, if any."""
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        
+        candidates = data if isinstance(data, list) else [data]
+        for item in candidates:
+            if not isinstance(item, dict):
+                continue
+            nodes = item.get('@graph', [item]) if isinstance(item.get('@graph'), list) else [item]
+            for node in nodes:
+                if not isinstance(node, dict):
+                    continue
+                types = node.get('@type', [])
+                types = [types] if isinstance(types, str) else types
+                if any(isinstance(t, str) and t.endswith('Article') for t in types):
+                    return node
+    
+    return None
+
+# JSON-LD bodies without line breaks are regrouped into paragraphs of this many sentences
+JSON_LD_SENTENCES_PER_PARAGRAPH = 3
+JSON_LD_METHOD = 'provider_json_ld'
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…])\s+(?=[¿¡"“«A-ZÁÉÍÓÚÑ])')
+
+def _json_ld_paragraphs(body: str, provider_config: Dict[str, Any]) -> str:
+    """Turns an articleBody into paragraphs and applies the provider's cleanup patterns.
+    
+    Publishers usually flatten the body into one line, which would post as a single wall of
+    text and leave the line-anchored cleanup patterns nothing to anchor on. Lines are kept
+    when there are any; otherwise sentences are cleaned one by one, then regrouped.
+    """
+    body = body.strip()
+    if '\n' in body:
+        paragraphs = [line.strip() for line in body.splitlines() if line.strip()]
+    else:
+        sentences = [final_content_cleanup(sentence, provider_config) for sentence in _SENTENCE_SPLIT_RE.split(body)]
+        sentences = [sentence for sentence in sentences if sentence]
+        paragraphs = [' '.join(sentences[i:i + JSON_LD_SENTENCES_PER_PARAGRAPH])
+                      for i in range(0, len(sentences), JSON_LD_SENTENCES_PER_PARAGRAPH)]
+    return final_content_cleanup('\n\n'.join(paragraphs), provider_config)
+
+def _json_ld_authors(author: Any) -> List[str]:
+    authors = author if isinstance(author, list) else [author]
+    names = [a.get('name') if isinstance(a, dict) else a for a in authors]
+    return [name.strip() for name in names if isinstance(name, str) and name.strip()]
+
+def _has_enough_unique(items: List[str], required: float, chunk_size: int = 256) -> bool:
+    """True once `required` distinct items are seen, stopping early instead of hashing the whole list."""
+    seen = set()
+    for start in range(0, len(items), chunk_size):
+        seen.update(items[start:start + chunk_size])
+        if len(seen) >= required:
+            return True
+    return False
+
 class DefaultProvider(BaseProvider):
-    def __init__(self, config):
-        super().__init__(config)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.config.extraction_user_agent
-        })
+    def __init__(self, config, session=None):
+        super().__init__(config, session or create_session(config.extraction_user_agent))
 
     def extract_article(self, url: str) -> Optional[Dict[str, Any]]:
         """Extract article content from URL with provider-specific formatting"""
@@ -27,18 +194,33 @@ class DefaultProvider(BaseProvider):
             
             extraction_methods = provider_config.get('method_priority', ['structured_beautifulsoup', 'enhanced_newspaper3k'])
             
+            # Every method works from the same download, so a fallback costs no extra request
+            try:
+                html, encoding = fetch_html(self.session, url, self.config.extraction_timeout,
+                                            max_bytes=self.config.max_download_bytes)
+            except Exception as e:
+                logger.warning(f"Failed to download {url}: {e}")
+                return None
+            
+            # Parse once as well: JSON-LD is read before cleanup strips the scripts, and
+            # the cleaned tree then serves both the structured and newspaper passes
+            soup = _make_soup(html, encoding)
+            json_ld_node = _find_json_ld_article(soup)
+            self._remove_unwanted_elements(soup, provider_config)
+            
             for method in extraction_methods:
                 try:
                     if method == 'structured_beautifulsoup':
-                        article_data = self._extract_structured_content(url, provider_config)
+                        article_data = self._extract_structured_content(url, provider_config, soup, json_ld_node)
                     elif method == 'enhanced_newspaper3k':
-                        article_data = self._extract_with_newspaper_enhanced(url, provider_config)
+                        article_data = self._extract_with_newspaper_enhanced(url, provider_config, html, soup)
                     else:
                         logger.warning(f"Unknown extraction method: {method}")
                         continue
                     
                     if article_data and self.is_valid_article(article_data, provider_config):
-                        article_data['extraction_method'] = method
+                        # A JSON-LD fallback inside a method keeps its own tag
+                        article_data.setdefault('extraction_method', method)
                         article_data['provider'] = provider_config.get('name', 'default')
                         return article_data
                         
@@ -56,104 +238,98 @@ class DefaultProvider(BaseProvider):
     def get_title(self, soup: BeautifulSoup, provider_config: Dict[str, Any]) -> str:
         title_selectors = provider_config.get('title', {}).get('selectors', ['h1', 'title'])
         
-        for selector in title_selectors:
-            element = soup.select_one(selector)
-            if element:
-                title = element.get('content') if element.get('content') else element.get_text()
-                if title and len(title.strip()) > 5:
-                    return self._clean_title(title.strip(), provider_config)
+        for element in _first_matches(soup, title_selectors):
+            title = (element.get('content') or element.get_text()).strip()
+            if len(title) > 5:
+                return self._clean_title(title, provider_config)
         
         return ""
 
     def get_content(self, soup: BeautifulSoup, provider_config: Dict[str, Any]) -> str:
         content_selectors = provider_config.get('content', {}).get('selectors', ['article'])
         
-        article_container = None
-        for selector in content_selectors:
-            container = soup.select_one(selector)
-            if container:
-                article_container = container
-                break
+        article_container = _select_first(soup, content_selectors)
         
         if not article_container:
             return ""
         
-        include_elements = provider_config.get('content', {}).get('include_elements', ['p', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        
-        return process_article_structure(article_container, include_elements)
+        return process_article_structure(article_container, _compile_provider(provider_config).include_elements)
 
     def get_authors(self, soup: BeautifulSoup, provider_config: Dict[str, Any]) -> List[str]:
         author_selectors = provider_config.get('author', {}).get('selectors', ['.author', '.autor'])
         
         authors = []
-        for selector in author_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                author = element.get('content') or element.get_text()
-                if author and author.strip():
-                    authors.append(author.strip())
+        if author_selectors:
+            # One walk for all selectors; bylines come back in document order
+            for element in _compile_selector(', '.join(author_selectors)).select(soup):
+                # Collapse internal whitespace so variants of the same byline dedupe
+                author = ' '.join((element.get('content') or element.get_text()).split())
+                if author:
+                    authors.append(author)
         
-        return list(set(authors))
+        return list(dict.fromkeys(authors))
 
     def get_publish_date(self, soup: BeautifulSoup, provider_config: Dict[str, Any]) -> Optional[str]:
         date_selectors = provider_config.get('date', {}).get('selectors', ['time', '.date'])
         
-        for selector in date_selectors:
-            element = soup.select_one(selector)
-            if element:
-                date_str = element.get('content') or element.get('datetime') or element.get_text()
-                if date_str:
-                    return date_str.strip()
+        for element in _first_matches(soup, date_selectors):
+            date_str = element.get('content') or element.get('datetime') or element.get_text()
+            if date_str:
+                return date_str.strip()
         
         return None
 
-    def _extract_structured_content(self, url: str, provider_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _extract_structured_content(self, url: str, provider_config: Dict[str, Any], soup: BeautifulSoup,
+                                    json_ld_node: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         try:
-            response = self.session.get(
-                url, 
-                timeout=self.config.extraction_timeout,
-                allow_redirects=True
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            self._remove_unwanted_elements(soup, provider_config)
+            # The provider's selectors give the curated output; publisher JSON-LD only fills gaps
+            json_ld = json_ld_node or {}
             
-            title = self.get_title(soup, provider_config)
+            title = self.get_title(soup, provider_config) or self._json_ld_title(json_ld, provider_config)
             
+            article = {}
             structured_content = self.get_content(soup, provider_config)
+            if structured_content:
+                cleaned_content = final_content_cleanup(structured_content, provider_config)
+            else:
+                # Selectors found no body (new layout, script-rendered page); fall back to the publisher's copy
+                body = json_ld.get('articleBody')
+                cleaned_content = _json_ld_paragraphs(body, provider_config) if isinstance(body, str) else ''
+                article['extraction_method'] = JSON_LD_METHOD
             
-            if not title or not structured_content:
+            if not title or not cleaned_content:
                 return None
             
-            cleaned_content = final_content_cleanup(structured_content, provider_config)
-            
-            return {
+            article.update({
                 'title': title,
                 'content': cleaned_content,
                 'summary': '',
-                'authors': self.get_authors(soup, provider_config),
-                'publish_date': self.get_publish_date(soup, provider_config),
+                'authors': self.get_authors(soup, provider_config) or _json_ld_authors(json_ld.get('author')),
+                'publish_date': self.get_publish_date(soup, provider_config) or json_ld.get('datePublished'),
                 'url': url,
-                'extraction_method': 'provider_structured'
-            }
+            })
+            return article
             
         except Exception as e:
             logger.debug(f"Provider structured extraction failed for {url}: {e}")
             return None
 
-    def _extract_with_newspaper_enhanced(self, url: str, provider_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _json_ld_title(self, node: Dict[str, Any], provider_config: Dict[str, Any]) -> str:
+        headline = node.get('headline')
+        if not isinstance(headline, str) or not headline.strip():
+            return ""
+        return self._clean_title(headline.strip(), provider_config)
+
+    def _extract_with_newspaper_enhanced(self, url: str, provider_config: Dict[str, Any],
+                                         html: bytes, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
         try:
-            article = Article(url)
-            article.download()
+            # Hand the shared download to newspaper instead of letting it fetch again;
+            # set_html decodes the bytes itself. Spanish stopwords fit the sites we cover,
+            # including pages without a <meta> language that would fall back to English
+            article = Article(url, language='es')
+            article.set_html(html)
             article.parse()
             
-            response = self.session.get(url, timeout=self.config.extraction_timeout)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            self._remove_unwanted_elements(soup, provider_config)
-            
             enhanced_content = self._enhance_newspaper_content(article.text, soup)
             
             cleaned_content = final_content_cleanup(enhanced_content, provider_config)
@@ -163,11 +339,12 @@ class DefaultProvider(BaseProvider):
             return {
                 'title': cleaned_title,
                 'content': cleaned_content,
-                'summary': article.summary if hasattr(article, 'summary') else '',
+                # article.nlp() is intentionally skipped: nothing consumes the summary
+                # and it would run NLTK tokenization on every article
+                'summary': '',
                 'authors': article.authors,
                 'publish_date': article.publish_date,
                 'url': url,
-                'extraction_method': 'enhanced_newspaper3k_provider'
             }
             
         except Exception as e:
@@ -175,39 +352,33 @@ class DefaultProvider(BaseProvider):
             return None
 
     def _remove_unwanted_elements(self, soup: BeautifulSoup, provider_config: Dict[str, Any]):
-        remove_elements = provider_config.get('remove_elements', [])
-        for selector in remove_elements:
-            for element in soup.select(selector):
-                element.decompose()
+        compiled = _compile_provider(provider_config)
+        if compiled.remove_elements:
+            _decompose_all(compiled.remove_elements.select(soup))
         
-        remove_classes = provider_config.get('remove_classes', [])
-        for class_pattern in remove_classes:
-            for element in soup.find_all(class_=re.compile(class_pattern, re.I)):
-                element.decompose()
+        if compiled.remove_classes:
+            _decompose_all(soup.find_all(class_=compiled.remove_classes))
 
     def _enhance_newspaper_content(self, newspaper_text: str, soup: BeautifulSoup) -> str:
         if not newspaper_text:
             return ""
         
         headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        heading_texts = [h.get_text().strip() for h in headings if h.get_text().strip()]
+        heading_texts = {text for text in (h.get_text().strip() for h in headings) if len(text) > 10}
         
         enhanced_text = newspaper_text
         
-        for heading in heading_texts:
-            if heading in enhanced_text and len(heading) > 10:
-                enhanced_text = enhanced_text.replace(
-                    heading,
-                    f"## {heading}"
-                )
+        if heading_texts:
+            # Longest first so a heading that contains another wins; one scan marks them all
+            alternation = '|'.join(map(re.escape, sorted(heading_texts, key=len, reverse=True)))
+            heading_re = re.compile(f'(?<!## )(?:{alternation})')
+            enhanced_text = heading_re.sub(lambda match: f"## {match.group(0)}", enhanced_text)
         
         return final_content_cleanup(enhanced_text, self.config.get_default_provider_config())
 
     def _clean_title(self, title: str, provider_config: Dict[str, Any]) -> str:
-        cleanup_patterns = provider_config.get('title', {}).get('cleanup_patterns', [])
-        
-        for pattern in cleanup_patterns:
-            title = re.sub(pattern, '', title, flags=re.I)
+        for pattern in _compile_provider(provider_config).title_cleanup_res:
+            title = pattern.sub('', title)
         
         return title.strip()
 
@@ -228,11 +399,11 @@ class DefaultProvider(BaseProvider):
             logger.debug("Article missing valid title")
             return False
         
-        reject_patterns = provider_config.get('quality', {}).get('reject_if_contains', [])
-        for pattern in reject_patterns:
-            if re.search(pattern, content, re.I | re.MULTILINE):
-                logger.debug(f"Article content matches rejection pattern: {pattern}")
-                return False
+        reject_re = _compile_provider(provider_config).reject_re
+        rejected = reject_re.search(content) if reject_re else None
+        if rejected:
+            logger.debug(f"Article content matches rejection pattern: {rejected.group(0)!r}")
+            return False
         
         min_ratio = provider_config.get('quality', {}).get('min_text_ratio', 0.6)
         if self._is_low_quality_content(content, min_ratio):
@@ -241,13 +412,14 @@ class DefaultProvider(BaseProvider):
         return True
 
     def _is_low_quality_content(self, content: str, min_text_ratio: float) -> bool:
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        if len(lines) > 5 and len(set(lines)) < len(lines) * min_text_ratio:
+        # The ratios are statistical, so a prefix sample decides them as well as the whole text
+        lines = list(islice(filter(None, map(str.strip, content.split('\n'))), QUALITY_SAMPLE_LINES))
+        if len(lines) > 5 and not _has_enough_unique(lines, len(lines) * min_text_ratio):
             logger.debug("Content has too many duplicate lines")
             return True
         
-        words = content.lower().split()
-        if len(words) > 50 and len(set(words)) < len(words) * (min_text_ratio * 0.7):
+        words = content.lower().split(None, QUALITY_SAMPLE_WORDS)[:QUALITY_SAMPLE_WORDS]
+        if len(words) > 50 and not _has_enough_unique(words, len(words) * (min_text_ratio * 0.7)):
             logger.debug("Content has poor word diversity")
             return True
         
@@ -14,6 +14,12 @@ import re
 
 logger = logging.getLogger(__name__)
 
+_STATUS_ID_RE = re.compile(r'/status/(\d+)')
+_STATUS_LINK_RE = re.compile(r'status/\d+')
+_MEDIA_LINK_RE = re.compile(r'(pic\.twitter\.com|t\.co)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_AUTHOR_HANDLE_RE = re.compile(r'([^(]+)\s*\((@\w+)\)')
+
 class XContentExtractor:
     """Extracts content from X/Twitter posts using oEmbed API."""
     
@@ -35,7 +41,7 @@ class XContentExtractor:
     def extract_tweet_id(self, url: str) -> Optional[str]:
         """Extract tweet ID from X/Twitter URL."""
         # Match pattern: /status/1234567890
-        match = re.search(r'/status/(\d+)', url)
+        match = _STATUS_ID_RE.search(url)
         return match.group(1) if match else None
     
     def get_oembed_data(self, url: str) -> Optional[Dict[str, Any]]:
@@ -71,7 +77,7 @@ class XContentExtractor:
             tweet_p = soup.find('p')
             if tweet_p:
                 # Check for media links before removing them
-                media_links = tweet_p.find_all('a', href=re.compile(r'(pic\.twitter\.com|t\.co)'))
+                media_links = tweet_p.find_all('a', href=_MEDIA_LINK_RE)
                 result['has_media'] = len(media_links) > 0
                 
                 # Remove media links from text
@@ -81,7 +87,7 @@ class XContentExtractor:
                 # Get clean text and handle line breaks
                 text = tweet_p.get_text()
                 # Replace multiple spaces with single space and clean up
-                result['text'] = re.sub(r'\s+', ' ', text).strip()
+                result['text'] = _WHITESPACE_RE.sub(' ', text).strip()
             
             # Extract author info from citation (— Author (@handle))
             full_text = soup.get_text()
@@ -90,13 +96,13 @@ class XContentExtractor:
                 
                 # Extract author name and handle
                 # Format: "Maximiliano Firtman (@maxifirtman) August 25, 2025"
-                author_match = re.search(r'([^(]+)\s*\((@\w+)\)', citation_part)
+                author_match = _AUTHOR_HANDLE_RE.search(citation_part)
                 if author_match:
                     result['author'] = author_match.group(1).strip()
                     result['handle'] = author_match.group(2)
             
             # Extract date from the link text
-            date_link = soup.find('a', href=re.compile(r'status/\d+'))
+            date_link = soup.find('a', href=_STATUS_LINK_RE)
             if date_link:
                 result['date'] = date_link.get_text().strip()
                 
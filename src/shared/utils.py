@@ -4,9 +4,15 @@ import sys
 import os
 import json
 import time
+import copy
+import queue
+import atexit
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional
 from functools import wraps
+from urllib.parse import urlsplit, urlunsplit
 from src.core.config import Config
 
 class StructuredLogFormatter(logging.Formatter):
@@ -136,8 +142,39 @@ class MetricsCollector:
 # Global metrics collector instance
 metrics = MetricsCollector()
 
-def setup_logging(config: Config):
-    """Setup detailed logging configuration with structured logging and monitoring"""
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener's handlers.
+    
+    The stock prepare() renders the record with a plain formatter, which would fold
+    tracebacks into the message before StructuredLogFormatter sees exc_info.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Writes queued log records from a background thread, see setup_logging(background=True)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+atexit.register(_stop_log_listener)
+
+def setup_logging(config: Config, background: bool = False):
+    """Setup detailed logging configuration with structured logging and monitoring
+    
+    With background, log calls only enqueue the record and a listener thread does the
+    file and console writes. Forking processes such as RQ workers must not use it: the
+    forked child has no listener thread and exits without flushing the queue.
+    """
+    global _log_listener
+    
     # Create logs directory
     log_path = config.log_file
     log_dir = '/'.join(log_path.split('/')[:-1])
@@ -189,10 +226,17 @@ def setup_logging(config: Config):
     
     # Clear existing handlers
     root_logger.handlers.clear()
+    _stop_log_listener()
     
     # Add new handlers
-    for handler in handlers:
-        root_logger.addHandler(handler)
+    if background:
+        log_queue = queue.Queue(-1)
+        _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _log_listener.start()
+        root_logger.addHandler(_DeferredFormatQueueHandler(log_queue))
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
     
     # Setup specific logger configurations
     _setup_component_loggers()
@@ -269,4 +313,93 @@ class ErrorTracker:
         }
 
 # Global error tracker instance
-error_tracker = ErrorTracker()
\ No newline at end of file
+error_tracker = ErrorTracker()
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time-to-live"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Get a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key, default=None):
+        """Remove a key, returning its value if present and unexpired"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def expire(self) -> int:
+        """Drop expired entries that were never read again, returning how many"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Query parameters added by ad trackers and share buttons; they never change the page served
+_TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid',
+    'yclid', 'twclid', 'igshid', 'mc_cid', 'mc_eid',
+})
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def _is_tracking_param(pair: str) -> bool:
+    name = pair.split('=', 1)[0].lower()
+    return name.startswith('utm_') or name in _TRACKING_PARAMS
+
+def canonicalize_url(url: str) -> str:
+    """Normalizes a link so tracking variants of the same page compare equal.
+    
+    Lowercases scheme and host, drops credentials, default ports, the fragment
+    and tracking parameters. Other query parameters keep their order and encoding, since
+    some sites need them to serve the article.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.rsplit('@', 1)[-1].lower()
+    if port is not None and port == _DEFAULT_PORTS.get(scheme):
+        netloc = netloc.rsplit(':', 1)[0]
+    
+    query = '&'.join(pair for pair in parts.query.split('&') if pair and not _is_tracking_param(pair))
+    return urlunsplit((scheme, netloc, parts.path, query, ''))
@@ -18,19 +18,20 @@ from src.core.config import Config
 from src.core.database import Database
 from src.clients.reddit import RedditClient
 from src.extractors.article import ArticleExtractor
-from src.clients.gemini import GeminiClient
 from src.extractors.x import XContentExtractor
 
 # Initialize shared components
 config = Config()
 database = Database(config)
-reddit_client = RedditClient(config)
+reddit_client = RedditClient(config, database)
 article_extractor = ArticleExtractor(config)
 
 # Initialize optional components
 gemini_client = None
 if config.youtube_enabled:
     try:
+        # Imported here: google-genai takes ~0.4s to load and is unused with YouTube off
+        from src.clients.gemini import GeminiClient
         gemini_client = GeminiClient()
     except Exception as e:
         logging.warning(f"Failed to initialize Gemini client in worker: {e}")
@@ -128,10 +129,18 @@ def process_discovered_post(subreddit: str, submission_data: Dict[str, Any]) ->
             "error": str(e)
         }
 
+def _post_deferred_replies():
+    """Continuation comments this worker's earlier jobs held back for Reddit's posting limit"""
+    try:
+        reddit_client.post_deferred_replies()
+    except Exception as e:
+        logger.error(f"Error posting deferred continuation comments: {e}")
+
 def process_article(post_id: str, url: str, submission_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process a news article: extract content and post Reddit comment"""
     try:
         logger.info(f"Processing article {post_id}: {url}")
+        _post_deferred_replies()
         
         # Extract article content
         article_data = article_extractor.extract_with_retry(url)
@@ -244,7 +253,7 @@ def process_youtube_video(post_id: str, url: str, submission_data: Dict[str, Any
         submission = reddit_client.reddit.submission(id=post_id)
         
         # Format comment using YouTube template
-        formatted_comment = config.youtube_summary_template.format(
+        formatted_comment = config.youtube_summary_render(
             title=video_data['title'],
             summary=video_data['summary'],
             url=url
@@ -339,7 +348,7 @@ def process_twitter_post(post_id: str, url: str, submission_data: Dict[str, Any]
             media_note = f"📎 *Contiene {tweet_data['media_count']} archivo(s) multimedia*"
         
         # Format comment using X/Twitter template
-        formatted_comment = config.x_twitter_comment_template.format(
+        formatted_comment = config.x_twitter_render(
             author=tweet_data['author'],
             date=tweet_data['date'],
             text=tweet_data['text'],
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for comment reply analytics.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.clients.internal.analytics import CommentAnalytics
+
+
+def _reply(reply_id, parent_id):
+    return SimpleNamespace(
+        id=reply_id, parent_id=f"t1_{parent_id}", author=SimpleNamespace(name='lector'),
+        body='gracias', score=1, created_utc=0, permalink=f"/r/argentina/comments/x/y/{reply_id}/",
+        context=f"/r/argentina/comments/x/y/{reply_id}/?context=3"
+    )
+
+
+class FakeReddit:
+    def __init__(self, inbox, threads):
+        self.inbox = SimpleNamespace(comment_replies=lambda limit: inbox[:limit])
+        self.threads = threads
+        self.refreshed = []
+
+    def comment(self, comment_id):
+        self.refreshed.append(comment_id)
+        return SimpleNamespace(refresh=lambda: None, replies=self.threads.get(comment_id, []))
+
+
+def _analytics(reddit):
+    connection = SimpleNamespace(get_reddit_instance=lambda: reddit)
+    return CommentAnalytics(config=None, connection=connection)
+
+
+def test_bulk_replies_come_from_one_inbox_scan():
+    reddit = FakeReddit(inbox=[_reply('c3', 'c1'), _reply('c2', 'b9')], threads={})
+
+    replies = _analytics(reddit).check_comment_replies_bulk(['c1', 'b9', 'b0'])
+
+    assert [r['id'] for r in replies['c1']] == ['c3']
+    assert [r['id'] for r in replies['b9']] == ['c2']
+    assert replies['b0'] == []
+    assert replies['c1'][0]['permalink'] == 'https://reddit.com/r/argentina/comments/x/y/c3/'
+    assert reddit.refreshed == []
+
+
+def test_bulk_replies_fall_back_for_comments_older_than_the_scan():
+    # Newest first; the scan stops at 'c3', so replies to the older 'b0' may lie further back
+    inbox = [_reply('c5', 'c4'), _reply('c3', 'c1'), _reply('a1', 'b0')]
+    reddit = FakeReddit(inbox=inbox, threads={'b0': [_reply('a1', 'b0')]})
+
+    with patch('src.clients.internal.analytics.INBOX_SCAN_LIMIT', 2):
+        replies = _analytics(reddit).check_comment_replies_bulk(['c4', 'b0'])
+
+    assert [r['id'] for r in replies['c4']] == ['c5']
+    assert [r['id'] for r in replies['b0']] == ['a1']
+    assert reddit.refreshed == ['b0']
+
+
+def test_bulk_replies_fall_back_when_the_inbox_fails():
+    reddit = FakeReddit(inbox=[], threads={'c1': [_reply('c3', 'c1')]})
+    reddit.inbox = SimpleNamespace(comment_replies=lambda limit: (_ for _ in ()).throw(RuntimeError('503')))
+
+    replies = _analytics(reddit).check_comment_replies_bulk(['c1'])
+
+    assert [r['id'] for r in replies['c1']] == ['c3']
+
+
+def test_comment_retriever_checks_recent_comments_in_bulk():
+    sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+    import comment_retriever
+
+    calls = []
+    client = SimpleNamespace(
+        get_bot_comments=lambda limit, subreddit: [{'id': 'c1'}, {'id': 'c2'}],
+        check_comment_replies=lambda comment_id: calls.append(('single', comment_id)) or [],
+        check_comment_replies_bulk=lambda comment_ids: calls.append(('bulk', comment_ids)) or {},
+    )
+    with patch.object(comment_retriever, 'Config'), \
+         patch.object(comment_retriever, 'RedditClient', return_value=client):
+        comment_retriever.get_comment_replies(limit=2)
+
+    assert calls == [('bulk', ['c1', 'c2'])]
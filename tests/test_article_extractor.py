@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ArticleExtractor caching and in-flight coalescing.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.core.config import Config
+from src.extractors.article import ArticleExtractor
+
+
+def _extractor(delay=0.0, result=None):
+    extractor = ArticleExtractor(Config())
+    calls = []
+    lock = threading.Lock()
+
+    def fake_extract(url):
+        with lock:
+            calls.append(url)
+        time.sleep(delay)
+        return dict(result) if result else None
+
+    extractor.extract_article = fake_extract
+    return extractor, calls
+
+
+def test_prefetched_url_is_not_downloaded_again():
+    extractor, calls = _extractor(delay=0.2, result={'title': 'Titulo', 'content': 'Texto'})
+    try:
+        extractor.prefetch(['https://www.clarin.com/nota', 'https://www.clarin.com/nota#comentarios'])
+        article = extractor.extract_with_retry('https://www.clarin.com/nota')
+    finally:
+        extractor.close()
+
+    assert article == {'title': 'Titulo', 'content': 'Texto'}
+    assert calls == ['https://www.clarin.com/nota']
+
+
+def test_failed_url_is_not_retried_until_it_expires():
+    extractor, calls = _extractor()
+    extractor.config.extraction.max_retries = 1
+    try:
+        assert extractor.extract_with_retry('https://www.clarin.com/caida') is None
+        assert extractor.extract_with_retry('https://www.clarin.com/caida') is None
+    finally:
+        extractor.close()
+
+    assert len(calls) == 1
+
+
+def test_close_releases_queued_prefetches():
+    extractor, calls = _extractor(result={'title': 'Titulo', 'content': 'Texto'})
+    release = threading.Event()
+    blocking_extract = extractor.extract_article
+
+    def slow_extract(url):
+        release.wait(5)
+        return blocking_extract(url)
+
+    extractor.extract_article = slow_extract
+    urls = [f'https://www.clarin.com/nota-{n}' for n in range(extractor.parallelism + 2)]
+    extractor.prefetch(urls)
+    # Every worker is busy, so the last two prefetches are still queued and get cancelled
+    extractor.close()
+    release.set()
+
+    started = time.monotonic()
+    article = extractor.extract_with_retry(urls[-1])
+
+    assert article == {'title': 'Titulo', 'content': 'Texto'}
+    assert time.monotonic() - started < 2
+    assert urls[-1] in calls
+
+
+def test_prefetch_after_close_does_not_leave_a_claim():
+    extractor, calls = _extractor(result={'title': 'Titulo', 'content': 'Texto'})
+    extractor.close()
+    extractor.prefetch(['https://www.clarin.com/nota'])
+
+    assert extractor.extract_with_retry('https://www.clarin.com/nota') == {'title': 'Titulo', 'content': 'Texto'}
+    assert calls == ['https://www.clarin.com/nota']
+
+
+def test_waiter_gives_up_after_the_extraction_time_bound():
+    extractor, _ = _extractor()
+    extractor.config.extraction.max_retries = 1
+    extractor.config.extraction.timeout = 0
+    extractor._claim('https://www.clarin.com/colgada')  # claimed by a worker that never finishes
+    try:
+        started = time.monotonic()
+        with patch('src.extractors.article.RETRY_MAX_DELAY', 0.2):
+            assert extractor.extract_with_retry('https://www.clarin.com/colgada') is None
+        assert time.monotonic() - started < 2
+    finally:
+        extractor.close()
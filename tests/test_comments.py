@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Unit tests for comment posting and formatting.
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from praw.exceptions import RedditAPIException
+
+from src.core.config import Config
+from src.clients.internal.comments import CommentManager
+
+
+RATELIMIT = ['RATELIMIT', "Looks like you've been doing that a lot. Take a break for 2 minutes before trying again.", 'ratelimit']
+
+
+class FakeComment:
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.replies = []
+        self.mod = SimpleNamespace(distinguish=lambda **kwargs: None)
+
+    def reply(self, body):
+        if self.failures:
+            raise RedditAPIException([self.failures.pop(0)])
+        self.replies.append(body)
+        return FakeComment()
+
+
+class FakeSubmission(FakeComment):
+    id = 'abc123'
+    fullname = 't3_abc123'
+    title = 'Una noticia'
+
+
+class FakeConnection:
+    """RedditConnection whose bot account lists the given comments"""
+
+    def __init__(self, own_comments=()):
+        self.reddit = SimpleNamespace(auth=SimpleNamespace(limits={'remaining': 100, 'reset_timestamp': 0}))
+        self.own_comments = list(own_comments)
+        self.listings = 0
+
+    def get_reddit_instance(self):
+        return self.reddit
+
+    def get_me(self):
+        return SimpleNamespace(comments=SimpleNamespace(new=self._list_comments))
+
+    def _list_comments(self, limit):
+        self.listings += 1
+        return self.own_comments[:limit]
+
+
+def _manager():
+    return CommentManager(Config(), FakeConnection())
+
+
+def test_continuation_waits_out_posting_rate_limit():
+    manager = _manager()
+    submission = FakeSubmission()
+    main_comment = FakeComment(failures=[RATELIMIT])
+    submission.reply = lambda body: main_comment
+
+    with patch('src.clients.internal.comments.time.sleep') as sleep:
+        assert manager.post_comments(submission, ['main', 'part 2'])
+
+    sleep.assert_called_once_with(121)
+    assert main_comment.replies == ['part 2']
+
+
+def test_other_api_errors_are_not_retried():
+    manager = _manager()
+    submission = FakeSubmission()
+    main_comment = FakeComment(failures=[['TOO_LONG', 'this is too long', 'text']])
+    submission.reply = lambda body: main_comment
+
+    with patch('src.clients.internal.comments.time.sleep') as sleep:
+        assert manager.post_comments(submission, ['main', 'part 2'])
+
+    sleep.assert_not_called()
+    assert main_comment.replies == []
+
+
+def test_format_comment_splits_article_longer_than_max_comment_length():
+    config = Config()
+    manager = CommentManager(config, FakeConnection())
+    paragraph = 'El gobierno anunció nuevas medidas económicas para el próximo trimestre. ' * 20
+    article = '\n\n'.join([paragraph.strip()] * 20)
+    assert len(article) > config.max_comment_length
+
+    parts = manager.format_comment(article, 'https://www.clarin.com/a', 'Medidas')
+
+    assert len(parts) > 1
+    assert all(len(part) <= config.max_comment_length for part in parts)
+    assert parts[0].startswith('# Medidas')
+    assert manager.format_comment(article, 'https://www.clarin.com/a', 'Medidas') == parts
+
+
+def _splitter(max_comment_length):
+    config = Config()
+    config.bot.max_comment_length = max_comment_length
+    return CommentManager(config, FakeConnection())
+
+
+def test_break_point_prefers_paragraph_then_sentence_then_word():
+    manager = _splitter(10000)
+
+    assert manager._find_good_break_point('a' * 80 + '\n\n' + 'b. c' * 4 + 'd' * 2) == 82
+    assert manager._find_good_break_point('a' * 75 + '. ' + 'b c' * 7 + 'd' * 2) == 77
+    assert manager._find_good_break_point('a' * 85 + ' ' + 'b' * 14) == 86
+    assert manager._find_good_break_point('a' * 100) == -1
+
+
+def test_break_point_only_counts_breaks_near_the_end():
+    manager = _splitter(10000)
+
+    # A sentence end in the first 70% and a space in the first 80% are too early
+    assert manager._find_good_break_point('a' * 20 + '. ' + 'b' * 78) == -1
+    assert manager._find_good_break_point('a' * 75 + ' ' + 'b' * 24) == -1
+
+
+def test_break_point_is_relative_to_start():
+    manager = _splitter(10000)
+    text = '\n\n' * 10 + 'a' * 80 + '\n\n' + 'b' * 18 + '. tail'
+
+    assert manager._find_good_break_point(text, 20, 120) == 82
+
+
+def test_split_breaks_at_paragraphs_and_drops_leading_whitespace():
+    manager = _splitter(100)
+    continuation_space = 100 - manager._continuation_overhead
+    content = 'a' * 80 + '\n\n\n ' + 'b' * 80 + '\n\n' + 'c' * 40
+
+    parts = manager._split_content_for_comments(content, 90)
+
+    assert parts == ['a' * 80 + '\n\n\n', 'b' * 80 + '\n\n', 'c' * 40]
+    assert all(len(part) <= continuation_space for part in parts[1:])
+
+
+def test_split_hard_cuts_text_without_break_points():
+    manager = _splitter(100)
+    continuation_space = 100 - manager._continuation_overhead
+    content = 'x' * 300
+
+    parts = manager._split_content_for_comments(content, 90)
+
+    assert parts[0] == 'x' * 90
+    assert all(len(part) == continuation_space for part in parts[1:-1])
+    assert ''.join(parts) == content
+
+
+def test_split_keeps_short_content_whole():
+    manager = _splitter(100)
+
+    assert manager._split_content_for_comments('', 90) == ['']
+    assert manager._split_content_for_comments('corto', 90) == ['corto']
+
+
+def _reference_split(content, first_space, continuation_space):
+    """The slice-based splitter the offset-based one replaced"""
+    def break_point(text):
+        tail_start = int(len(text) * 0.7) + 1
+        paragraph = text.rfind('\n\n', tail_start)
+        if paragraph >= 0:
+            return paragraph + 2
+        sentence = max(text.rfind(mark, tail_start) for mark in ('. ', '.\n', '! ', '!\n', '? ', '?\n'))
+        if sentence >= 0:
+            return sentence + 2
+        space = text.rfind(' ', int(len(text) * 0.8) + 1)
+        return space + 1 if space >= 0 else -1
+
+    parts, remaining, space = [], content, first_space
+    while remaining:
+        if parts and len(remaining) <= space:
+            parts.append(remaining)
+            break
+        chunk = remaining[:space]
+        cut = break_point(chunk)
+        cut = cut if cut > 0 else space
+        parts.append(remaining[:cut])
+        remaining = remaining[cut:].lstrip()
+        space = continuation_space
+    return parts
+
+
+def test_split_matches_slice_based_reference():
+    manager = _splitter(300)
+    continuation_space = 300 - manager._continuation_overhead
+    words = ['Hoy', 'el', 'dólar', 'subió.', 'Mañana', '¿bajará?', 'Nadie', 'sabe!', 'inflación\n\n', 'x' * 120]
+    for seed in range(40):
+        content = ' '.join(words[(seed * 7 + i * (seed % 5 + 1)) % len(words)] for i in range(150 + seed * 9))
+
+        assert manager._split_content_for_comments(content, 250) == _reference_split(content, 250, continuation_space)
+
+
+def test_has_commented_lists_own_comments_once_per_cycle():
+    connection = FakeConnection([SimpleNamespace(link_id='t3_old1')])
+    manager = CommentManager(Config(), connection)
+
+    assert manager.has_commented(SimpleNamespace(id='old1', fullname='t3_old1'))
+    assert not manager.has_commented(SimpleNamespace(id='new1', fullname='t3_new1'))
+    assert not manager.has_commented(SimpleNamespace(id='new2', fullname='t3_new2'))
+    assert connection.listings == 1
+
+    with patch('src.clients.internal.comments.time.monotonic', return_value=time.monotonic() + 3600):
+        assert not manager.has_commented(SimpleNamespace(id='new2', fullname='t3_new2'))
+    assert connection.listings == 2
+
+
+RATELIMIT_9_MINUTES = ['RATELIMIT', 'Take a break for 9 minutes before trying again.', 'ratelimit']
+
+
+def test_long_rate_limit_defers_remaining_parts():
+    manager = _manager()
+    submission = FakeSubmission()
+    main_comment = FakeComment(failures=[RATELIMIT_9_MINUTES, RATELIMIT_9_MINUTES])
+    submission.reply = lambda body: main_comment
+    clock = [1000.0]
+
+    with patch('src.clients.internal.comments.time.monotonic', side_effect=lambda: clock[0]), \
+         patch('src.clients.internal.comments.time.sleep', side_effect=lambda s: clock.__setitem__(0, clock[0] + s)) as sleep:
+        assert manager.post_comments(submission, ['main', 'part 2', 'part 3'])
+        # One 541s wait fits the budget; a second one would not, so the parts wait for a later cycle
+        assert sleep.call_count == 1
+        assert main_comment.replies == []
+
+        assert manager.post_deferred_replies() == 0
+        clock[0] += 600
+        assert manager.post_deferred_replies() == 1
+
+    assert main_comment.replies == ['part 2', 'part 3']
+    assert manager.post_deferred_replies() == 0
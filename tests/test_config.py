@@ -6,7 +6,9 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.core.config import Config
+import pytest
+
+from src.core.config import Config, ConfigurationError, compile_template
 
 def test_config():
     print("Testing configuration...")
@@ -23,5 +25,26 @@ def test_config():
     except Exception as e:
         print(f"❌ Configuration validation failed: {e}")
 
+def test_compiled_templates_match_str_format():
+    config = Config()
+    tweet = dict(author='@clarincom', date='1 ene 2025', text='Texto {con llaves}', media_note='', url='https://x.com/a/status/1')
+    assert config.x_twitter_render(**tweet) == config.x_twitter_comment_template.format(**tweet)
+    assert config.youtube_summary_render is config.youtube_summary_render
+    
+    assert compile_template('{{literal}} {n}')(n=3) == '{literal} 3'
+    assert compile_template('{n:>4}')(n=3) == '   3'
+
+def test_validate_rejects_inverted_interval_backoff():
+    config = Config()
+    config.bot.check_interval_growth = 1.0
+    config.bot.min_check_interval = 600
+    config.bot.max_check_interval = 60
+    
+    with pytest.raises(ConfigurationError) as error:
+        config.validate()
+    
+    assert 'check_interval_growth must be greater than 1' in str(error.value)
+    assert 'min_check_interval (600) must not exceed max_check_interval (60)' in str(error.value)
+
 if __name__ == "__main__":
     test_config()
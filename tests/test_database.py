@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the processed-post and comment records.
+"""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import pytest
+
+from src.core.config import Config
+import src.core.database as database_module
+from src.core.database import Database, COMMENTED_RETENTION_DAYS
+
+
+@pytest.fixture
+def database(tmp_path):
+    config = Config()
+    config.database.path = str(tmp_path / 'bot.db')
+    db = Database(config)
+    yield db
+    db.close()
+
+
+def _insert_processed(database, post_ids):
+    with sqlite3.connect(database.db_path) as conn:
+        conn.executemany(
+            'INSERT INTO processed_posts (post_id, subreddit, title, url, created_utc, success) VALUES (?, ?, ?, ?, 0, 1)',
+            [(post_id, 'argentina', 'titulo', 'https://www.clarin.com/a') for post_id in post_ids]
+        )
+
+
+def test_record_comment_is_remembered(database):
+    assert not database.has_commented_on('abc123')
+
+    database.record_comment('abc123')
+    database.record_comment('abc123')
+
+    assert database.has_commented_on('abc123')
+    assert not database.has_commented_on('def456')
+
+
+def test_cleanup_forgets_comments_after_retention(database):
+    database.record_comment('recent')
+    database.record_comment('old')
+    with sqlite3.connect(database.db_path) as conn:
+        conn.execute(
+            'UPDATE commented_submissions SET commented_at = ? WHERE submission_id = ?',
+            (datetime.now() - timedelta(days=COMMENTED_RETENTION_DAYS + 1), 'old')
+        )
+
+    database.cleanup_old_entries()
+
+    assert database.has_commented_on('recent')
+    assert not database.has_commented_on('old')
+
+
+def test_filter_unprocessed_batches_large_id_lists(database, monkeypatch):
+    monkeypatch.setattr(database_module, '_MAX_QUERY_PARAMS', 3)
+    post_ids = [f'p{n}' for n in range(10)]
+    _insert_processed(database, post_ids[::2])
+
+    statements = []
+    connect = database._connect
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+    monkeypatch.setattr(database, '_connect', traced_connect)
+
+    assert database.filter_unprocessed(post_ids + ['p1']) == set(post_ids[1::2])
+    # Ten distinct IDs in batches of three
+    assert sum(statement.startswith('SELECT post_id') for statement in statements) == 4
+    assert database.filter_unprocessed([]) == set()
+
+
+def test_filter_unprocessed_beyond_sqlite_parameter_limit(database):
+    post_ids = [f'p{n}' for n in range(1200)]
+    _insert_processed(database, post_ids[:1000])
+
+    assert database.filter_unprocessed(post_ids) == set(post_ids[1000:])
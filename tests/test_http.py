@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the extraction HTTP helpers.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import requests
+
+from src.extractors.http import HostLimiter
+
+
+def _response(url, status_code, headers=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_host_limiter_backs_off_on_429():
+    limiter = HostLimiter(initial_limit=4, max_limit=8, increase_after=2)
+    limiter.observe(_response('https://www.clarin.com/a', 429, {'Retry-After': '0'}))
+
+    assert limiter.limit('www.clarin.com') == 2
+    assert limiter.limit('www.lanacion.com.ar') == 4
+
+
+def test_host_limiter_recovers_after_successes():
+    limiter = HostLimiter(initial_limit=1, max_limit=2, increase_after=2)
+    for _ in range(6):
+        limiter.observe(_response('https://www.clarin.com/a', 200))
+
+    assert limiter.limit('www.clarin.com') == 2
+
+    with limiter.slot('https://www.clarin.com/b'):
+        pass
+
+
+def test_host_limiter_keys_redirected_responses_on_the_requested_host():
+    limiter = HostLimiter(initial_limit=4, max_limit=8, increase_after=1)
+    hop = _response('https://clarin.com/a', 301, {'Location': 'https://www.clarin.com/a'})
+    final = _response('https://www.clarin.com/a', 429, {'Retry-After': '0'})
+    final.history = [hop]
+
+    # The hook sees the redirect hop first, then the final response
+    limiter.observe(hop)
+    limiter.observe(final)
+
+    assert limiter.limit('clarin.com') == 2
+    assert limiter.limit('www.clarin.com') == 4
+
+
+def test_host_limiter_forgets_idle_hosts():
+    limiter = HostLimiter(max_hosts=3)
+    with limiter.slot('https://busy.example/a'):
+        for n in range(10):
+            with limiter.slot(f'https://site{n}.example/a'):
+                pass
+        limiter.observe(_response('https://slow.example/a', 429, {'Retry-After': '30'}))
+
+        assert len(limiter) <= 3
+        assert 'busy.example' in limiter._hosts
+        assert 'slow.example' in limiter._hosts
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the adaptive polling interval.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.core.lifecycle import BotLifecycle
+
+
+def _lifecycle(check_interval=60):
+    config = SimpleNamespace(check_interval=check_interval, min_check_interval=15,
+                             max_check_interval=300, check_interval_growth=2.0)
+    return BotLifecycle(SimpleNamespace(config=config))
+
+
+def test_interval_shrinks_while_posts_arrive_down_to_the_minimum():
+    lifecycle = _lifecycle()
+
+    assert lifecycle._next_interval(3) == 30
+    assert lifecycle._next_interval(1) == 15
+    assert lifecycle._next_interval(5) == 15
+
+
+def test_interval_grows_while_quiet_up_to_the_maximum():
+    lifecycle = _lifecycle()
+
+    assert [lifecycle._next_interval(0) for _ in range(4)] == [120, 240, 300, 300]
+    assert lifecycle._next_interval(2) == 150
+
+
+def test_interval_outside_the_bounds_is_clamped_on_the_next_cycle():
+    assert _lifecycle(check_interval=1000)._next_interval(0) == 300
+    assert _lifecycle(check_interval=5)._next_interval(4) == 15
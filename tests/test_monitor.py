@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Unit tests for PostMonitor's 'before' cursor polling and ProcessingCycle's cursor commits.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.clients.internal.monitor import PostMonitor, EMPTY_POLLS_BEFORE_CURSOR_CHECK
+from src.core.cycle import ProcessingCycle, MAX_POST_ATTEMPTS
+
+
+def _post(number):
+    return SimpleNamespace(id=f'p{number}', fullname=f't3_p{number}', url='https://www.clarin.com/nota',
+                           author='autor', removed_by_category=None)
+
+
+class FakeSubreddit:
+    """Newest-first /new listing that honours Reddit's 'before' parameter"""
+
+    def __init__(self, posts=()):
+        self.posts = list(posts)  # oldest first
+        self.requests = []
+        self.errors = []
+
+    def new(self, limit, params):
+        before = params.get('before')
+        self.requests.append(before)
+        if self.errors:
+            raise self.errors.pop(0)
+        newest_first = self.posts[::-1]
+        if before is None:
+            return newest_first[:limit]
+        fullnames = [post.fullname for post in newest_first]
+        if before not in fullnames:
+            return []
+        # 'before' pages toward newer posts: the ones closest to the cursor come back
+        newer = newest_first[:fullnames.index(before)]
+        return newer[-limit:]
+
+
+class FakeReddit:
+    def __init__(self, subreddit):
+        self._subreddit = subreddit
+        self.info_results = []
+
+    def subreddit(self, name):
+        return self._subreddit
+
+    def info(self, fullnames):
+        return self.info_results
+
+
+def _monitor(posts=()):
+    subreddit = FakeSubreddit(posts)
+    reddit = FakeReddit(subreddit)
+    config = SimpleNamespace(news_domains=['clarin.com'], blocked_domains=[])
+    return PostMonitor(config, reddit), subreddit, reddit
+
+
+def _poll(monitor, limit=10):
+    return [post.id for post in monitor.get_new_posts('argentina', limit=limit, only_unseen=True)]
+
+
+def test_cursor_moves_only_on_commit():
+    monitor, subreddit, _ = _monitor([_post(1), _post(2)])
+
+    assert _poll(monitor) == ['p2', 'p1']
+    # Not committed: the same posts come back
+    assert _poll(monitor) == ['p2', 'p1']
+
+    monitor.commit_cursor('argentina')
+    subreddit.posts.append(_post(3))
+    assert _poll(monitor) == ['p3']
+    assert subreddit.requests[-1] == 't3_p2'
+
+
+def test_cursor_pages_through_a_backlog():
+    monitor, subreddit, _ = _monitor([_post(1)])
+    _poll(monitor)
+    monitor.commit_cursor('argentina')
+
+    subreddit.posts.extend(_post(n) for n in range(2, 7))
+    # A full page behind the cursor also brings in the newest posts
+    assert _poll(monitor, limit=2) == ['p6', 'p5', 'p3', 'p2']
+    monitor.commit_cursor('argentina')
+    assert _poll(monitor, limit=2) == ['p6', 'p5', 'p4']
+    monitor.commit_cursor('argentina')
+    assert _poll(monitor, limit=2) == ['p6']
+
+
+def test_quiet_subreddit_keeps_its_cursor():
+    monitor, subreddit, reddit = _monitor([_post(1)])
+    _poll(monitor)
+    monitor.commit_cursor('argentina')
+    reddit.info_results = [_post(1)]
+
+    for _ in range(EMPTY_POLLS_BEFORE_CURSOR_CHECK * 3):
+        assert _poll(monitor) == []
+    assert subreddit.requests[1:] == ['t3_p1'] * (EMPTY_POLLS_BEFORE_CURSOR_CHECK * 3)
+
+
+def test_deleted_cursor_post_resets_to_full_listing():
+    monitor, subreddit, reddit = _monitor([_post(1), _post(2)])
+    _poll(monitor)
+    monitor.commit_cursor('argentina')
+    del subreddit.posts[-1]  # the cursor post disappears from /new
+    reddit.info_results = [SimpleNamespace(author=None, removed_by_category='deleted')]
+
+    for _ in range(EMPTY_POLLS_BEFORE_CURSOR_CHECK):
+        assert _poll(monitor) == []
+    assert _poll(monitor) == ['p1']
+    assert subreddit.requests[-1] is None
+
+
+def _cycle(monitor, database, process):
+    reddit_client = SimpleNamespace(
+        get_new_posts=monitor.get_new_posts,
+        commit_cursor=monitor.commit_cursor,
+        reset_cursor=monitor.reset_cursor,
+        post_deferred_replies=lambda: 0,
+    )
+    bot_manager = SimpleNamespace(
+        config=SimpleNamespace(subreddits=['argentina'], max_posts_per_check=10),
+        reddit_client=reddit_client,
+        database=database,
+        article_extractor=SimpleNamespace(prefetch=lambda urls: None),
+        queue_manager=SimpleNamespace(is_available=lambda: True),  # skips article prefetch
+        monitor=SimpleNamespace(update_queue_status=lambda stats: None),
+        submission_handler=SimpleNamespace(process_submission=process),
+    )
+    bot_manager.queue_manager.get_queue_stats = lambda: {}
+    return ProcessingCycle(bot_manager)
+
+
+def test_cycle_refetches_posts_after_database_error():
+    monitor, subreddit, _ = _monitor([_post(1)])
+    seen = []
+    database = SimpleNamespace(filter_unprocessed=lambda ids: None)
+    cycle = _cycle(monitor, database, lambda submission, name: seen.append(submission.id) or True)
+
+    assert cycle.process_cycle() == 0
+    assert seen == []
+
+    database.filter_unprocessed = lambda ids: set(ids)
+    cycle.process_cycle()
+    assert seen == ['p1']
+    assert subreddit.requests == [None, None]
+
+
+def test_cycle_keeps_cursor_when_a_post_raises():
+    monitor, subreddit, _ = _monitor([_post(1)])
+    database = SimpleNamespace(filter_unprocessed=lambda ids: set(ids))
+
+    def fail(submission, name):
+        raise RuntimeError('boom')
+
+    _cycle(monitor, database, fail).process_cycle()
+    subreddit.posts.append(_post(2))
+    seen = []
+    _cycle(monitor, database, lambda submission, name: seen.append(submission.id) or True).process_cycle()
+
+    assert seen == ['p2', 'p1']
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.processed = set()
+
+    def filter_unprocessed(self, ids):
+        return set(ids) - self.processed
+
+
+def test_cursor_stops_short_of_the_oldest_post_that_raised():
+    monitor, subreddit, _ = _monitor([_post(1), _post(2), _post(3)])
+    _poll(monitor)
+
+    monitor.commit_cursor('argentina', unhandled={'t3_p2'})
+    assert _poll(monitor) == ['p3', 'p2']
+
+
+def test_post_that_always_raises_does_not_stall_its_subreddit():
+    monitor, subreddit, _ = _monitor([_post(0)])
+    _poll(monitor)
+    monitor.commit_cursor('argentina')
+    subreddit.posts.extend(_post(n) for n in range(1, 16))
+    database = FakeDatabase()
+    attempts = []
+
+    def process(submission, name):
+        if submission.id == 'p1':
+            attempts.append(submission.id)
+            raise RuntimeError('boom')
+        database.processed.add(submission.id)
+        return True
+
+    cycle = _cycle(monitor, database, process)
+    for _ in range(5):
+        cycle.process_cycle()
+
+    assert database.processed == {f'p{n}' for n in range(2, 16)}
+    assert len(attempts) == MAX_POST_ATTEMPTS
+    assert subreddit.requests[-1] == 't3_p15'
+
+
+def test_fetch_error_does_not_commit_an_earlier_fetch():
+    monitor, subreddit, _ = _monitor([_post(1), _post(2)])
+    database = FakeDatabase()
+    failures = {'p1'}
+
+    def process(submission, name):
+        if submission.id in failures:
+            failures.remove(submission.id)
+            raise RuntimeError('boom')
+        database.processed.add(submission.id)
+        return True
+
+    cycle = _cycle(monitor, database, process)
+    cycle.process_cycle()
+    subreddit.errors.append(RuntimeError('503'))
+    cycle.process_cycle()
+    assert monitor._cursors == {}
+
+    cycle.process_cycle()
+    assert database.processed == {'p1', 'p2'}
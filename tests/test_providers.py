@@ -1,18 +1,27 @@
 #!/usr/bin/env python3
 """
-Unit tests for the Infobae provider.
-Tests article extraction with proper cleanup of "Últimas noticias" sections.
+Unit tests for the news providers.
+Tests article extraction with proper cleanup of "Últimas noticias" sections, and the
+site-specific Clarín and La Nación configs against saved article markup.
 """
 
 import unittest
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from src.core.config import Config
 from src.extractors.providers.infobae import InfobaeProvider
+from src.extractors.providers.default import DefaultProvider
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+PROSE = ("El Ministerio de Economía oficializó este viernes una serie de modificaciones en el régimen "
+         "de importaciones. Las empresas podrán tramitar las licencias en un plazo menor y con menos "
+         "documentación, una demanda histórica de las cámaras del sector.")
 
 
 class TestInfobaeProvider(unittest.TestCase):
@@ -43,5 +52,112 @@ class TestInfobaeProvider(unittest.TestCase):
             self.assertTrue(result.get('title'))   # Should have a title
 
 
+
+class SiteProviderFixtureTest(unittest.TestCase):
+    """Runs DefaultProvider over a trimmed copy of a site's article markup"""
+    
+    url = None
+    fixture = None
+    domain = None
+    
+    def setUp(self):
+        self.config = Config()
+        self.provider = DefaultProvider(self.config)
+        self.provider_config = self.config.get_provider_config(self.domain)
+    
+    def extract(self):
+        html = (FIXTURES / self.fixture).read_bytes()
+        with patch('src.extractors.providers.default.fetch_html', return_value=(html, 'utf-8')):
+            return self.provider.extract_article(self.url)
+    
+    def clean_title(self, title):
+        return self.provider._clean_title(title, self.provider_config)
+    
+    def is_rejected(self, content):
+        article = {'title': 'Un título suficientemente largo', 'content': content}
+        return not self.provider.is_valid_article(article, self.provider_config)
+    
+    def assert_error_page_rejected(self, heading):
+        self.assertFalse(self.is_rejected(PROSE))
+        self.assertTrue(self.is_rejected(f'{heading}\n\n{PROSE}'))
+
+
+class TestClarinProvider(SiteProviderFixtureTest):
+    url = 'https://www.clarin.com/economia/gobierno-anuncio-cambios-regimen-importaciones_0_abc123.html'
+    fixture = 'clarin_article.html'
+    domain = 'clarin.com'
+    
+    def test_story_selectors_resolve(self):
+        article = self.extract()
+        
+        self.assertIsNotNone(article)
+        self.assertEqual(article['provider'], 'Clarín')
+        self.assertEqual(article['extraction_method'], 'structured_beautifulsoup')
+        self.assertEqual(article['title'], 'El Gobierno anunció cambios en el régimen de importaciones')
+        self.assertIn('El Ministerio de Economía oficializó', article['content'])
+        self.assertIn('## Qué cambia para las empresas', article['content'])
+        # Only div.StoryTextContainer is read, not the surrounding <article>
+        self.assertNotIn('Otra nota que no pertenece', article['content'])
+        self.assertEqual(article['authors'], ['Juan Pérez'])
+    
+    def test_cleanup_patterns_apply(self):
+        article = self.extract()
+        
+        self.assertNotIn('Mirá también', article['content'])
+        self.assertEqual(self.clean_title('Una nota de economía - Clarín.com'), 'Una nota de economía')
+        self.assertEqual(self.clean_title('Una nota de economía - Clarin'), 'Una nota de economía')
+    
+    def test_error_pages_are_rejected(self):
+        self.assert_error_page_rejected('Página no encontrada')
+    
+    def test_selectors_win_over_json_ld_body(self):
+        article = self.extract()
+        
+        self.assertNotIn('Texto plano del JSON-LD', article['content'])
+        self.assertEqual(article['authors'], ['Juan Pérez'])
+    
+    def test_json_ld_body_is_the_fallback(self):
+        self.fixture = 'clarin_json_ld_article.html'
+        article = self.extract()
+        
+        self.assertIsNotNone(article)
+        self.assertEqual(article['extraction_method'], 'provider_json_ld')
+        self.assertEqual(article['title'], 'El Gobierno anunció cambios en el régimen de importaciones')
+        self.assertEqual(article['authors'], ['Juan Pérez'])
+        self.assertEqual(article['publish_date'], '2025-08-15T10:30:00-03:00')
+        # The flattened body comes back as paragraphs, with the "see also" sentence cleaned out
+        paragraphs = article['content'].split('\n\n')
+        self.assertEqual(len(paragraphs), 3)
+        self.assertTrue(paragraphs[0].startswith('El Ministerio de Economía oficializó'))
+        self.assertNotIn('Mirá también', article['content'])
+
+
+class TestLaNacionProvider(SiteProviderFixtureTest):
+    url = 'https://www.lanacion.com.ar/politica/como-sigue-la-negociacion-salarial-nid15082025/'
+    fixture = 'lanacion_article.html'
+    domain = 'lanacion.com.ar'
+    
+    def test_story_selectors_resolve(self):
+        article = self.extract()
+        
+        self.assertIsNotNone(article)
+        self.assertEqual(article['provider'], 'La Nación')
+        self.assertEqual(article['extraction_method'], 'structured_beautifulsoup')
+        self.assertEqual(article['title'], 'Cómo sigue la negociación salarial en la provincia')
+        self.assertIn('Los gremios estatales', article['content'])
+        self.assertNotIn('Más leídas', article['content'])
+        self.assertNotIn('Publicidad', article['content'])
+    
+    def test_cleanup_patterns_apply(self):
+        article = self.extract()
+        
+        self.assertNotIn('Te puede interesar', article['content'])
+        self.assertNotIn('Conforme a los criterios de', article['content'])
+        self.assertEqual(self.clean_title('Una nota de política - LA NACION'), 'Una nota de política')
+    
+    def test_error_pages_are_rejected(self):
+        self.assert_error_page_rejected('Error 404')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for shared utilities.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.shared.utils import TTLCache, canonicalize_url
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    # Touch 'a' so 'b' becomes the eviction candidate
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set('a', 1)
+
+    assert cache.get('a', 'missing') == 'missing'
+    assert len(cache) == 0
+
+
+def test_ttl_cache_clear():
+    cache = TTLCache()
+    cache.set('a', 1)
+    cache.clear()
+
+    assert cache.get('a') is None
+
+
+def test_ttl_cache_pop():
+    cache = TTLCache()
+    cache.set('a', 1)
+
+    assert cache.pop('a') == 1
+    assert cache.pop('a', 'missing') == 'missing'
+    assert len(cache) == 0
+
+
+def test_canonicalize_url_drops_tracking_parts():
+    url = 'HTTPS://WWW.Clarin.com:443/politica/nota.html?utm_source=twitter&id=5&fbclid=abc#comentarios'
+
+    assert canonicalize_url(url) == 'https://www.clarin.com/politica/nota.html?id=5'
+
+
+def test_canonicalize_url_keeps_other_query_encoding():
+    url = 'https://www.lanacion.com.ar:8443/nota/?q=a%2Fb&page=2'
+
+    assert canonicalize_url(url) == url
+
+
+def test_ttl_cache_expire_drops_only_stale_entries():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set('a', 1)
+    cache.ttl = 60
+    cache.set('b', 2)
+
+    assert cache.expire() == 1
+    assert cache.get('b') == 2
+    assert len(cache) == 1
@@ -55,14 +55,25 @@ def get_stats(days=7):
     except Exception as e:
         return f"Error getting stats: {e}"
 
-def get_comment_replies(comment_id):
-    """Get replies to a specific CanillitaBot comment"""
+def get_comment_replies(comment_ids=None, limit=25, subreddit=None):
+    """Get replies to the given CanillitaBot comments, or to its recent ones"""
     try:
         config = Config()
         reddit_client = RedditClient(config)
         
-        print(f"Fetching replies to comment {comment_id}...")
-        replies = reddit_client.check_comment_replies(comment_id)
+        if len(comment_ids or []) == 1:
+            print(f"Fetching replies to comment {comment_ids[0]}...")
+            replies = reddit_client.check_comment_replies(comment_ids[0])
+            return json.dumps(replies, indent=2, default=str)
+        
+        if not comment_ids:
+            print(f"Fetching replies to {limit} recent comments...")
+            comment_ids = [comment['id'] for comment in reddit_client.get_bot_comments(limit=limit, subreddit=subreddit)]
+        else:
+            print(f"Fetching replies to {len(comment_ids)} comments...")
+        
+        # A few inbox pages cover every comment instead of one request per comment
+        replies = reddit_client.check_comment_replies_bulk(comment_ids)
         
         return json.dumps(replies, indent=2, default=str)
     
@@ -135,7 +146,7 @@ def main():
     parser.add_argument('--format', '-f', choices=['json', 'readable', 'summary'], 
                        default='readable', help='Output format')
     parser.add_argument('--comment-id', '-c', type=str,
-                       help='Comment ID for replies command')
+                       help='Comma-separated comment IDs for replies command (default: recent comments)')
     
     args = parser.parse_args()
     
@@ -144,10 +155,8 @@ def main():
     elif args.command == 'stats':
         result = get_stats(args.days)
     elif args.command == 'replies':
-        if not args.comment_id:
-            print("Error: --comment-id required for replies command")
-            sys.exit(1)
-        result = get_comment_replies(args.comment_id)
+        comment_ids = [c.strip() for c in args.comment_id.split(',') if c.strip()] if args.comment_id else None
+        result = get_comment_replies(comment_ids, args.limit, args.subreddit)
     
     print(result)
 